@@ -3,13 +3,27 @@ Configuration centralisée de l'application KAIVAA Builder.
 Gère les variables d'environnement et les chemins.
 """
 
+import functools
 import os
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
-# Chargement des variables d'environnement
-load_dotenv()
+# Chargement des variables d'environnement (une seule fois par process)
+_DOTENV_LOADED = False
+
+if not _DOTENV_LOADED:
+    load_dotenv()
+    _DOTENV_LOADED = True
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> dict:
+    """Copie unique de l'environnement, évite de re-parcourir os.environ."""
+    return dict(os.environ)
+
+
+_env = _load_env()
 
 # Chemins de base
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -19,19 +33,38 @@ TEMPLATES_DIR = PROJECT_ROOT / "templates"
 OUTPUT_DIR = PROJECT_ROOT / "output"
 LOGS_DIR = PROJECT_ROOT / "logs"
 
+# Cache des dossiers déjà vérifiés : un seul stat/mkdir par process
+_ensured_dirs: set = set()
+
+
+def ensure_dir(path: Path) -> None:
+    """
+    S'assure qu'un dossier existe, avec mémoïsation par process.
+    Un dossier déjà vérifié ne déclenche plus aucun syscall.
+    """
+    path = Path(path)
+    if path in _ensured_dirs:
+        return
+    try:
+        os.stat(path)
+    except FileNotFoundError:
+        path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(path)
+
+
 # Création des dossiers s'ils n'existent pas
 for directory in [TEMPLATES_DIR, OUTPUT_DIR, LOGS_DIR]:
-    directory.mkdir(exist_ok=True)
+    ensure_dir(directory)
 
 
 class DatabaseConfig:
     """Configuration PostgreSQL"""
     
-    HOST: str = os.getenv("DB_HOST", "localhost")
-    PORT: int = int(os.getenv("DB_PORT", "5432"))
-    NAME: str = os.getenv("DB_NAME", "kaivaa_builder")
-    USER: str = os.getenv("DB_USER", "postgres")
-    PASSWORD: str = os.getenv("DB_PASSWORD", "")
+    HOST: str = _env.get("DB_HOST", "localhost")
+    PORT: int = int(_env.get("DB_PORT", "5432"))
+    NAME: str = _env.get("DB_NAME", "kaivaa_builder")
+    USER: str = _env.get("DB_USER", "postgres")
+    PASSWORD: str = _env.get("DB_PASSWORD", "")
     
     @classmethod
     def get_connection_string(cls) -> str:
@@ -42,9 +75,9 @@ class DatabaseConfig:
 class AppConfig:
     """Configuration de l'application"""
     
-    ENV: str = os.getenv("APP_ENV", "development")
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-prod")
+    ENV: str = _env.get("APP_ENV", "development")
+    LOG_LEVEL: str = _env.get("LOG_LEVEL", "INFO")
+    SECRET_KEY: str = _env.get("SECRET_KEY", "dev-secret-key-change-in-prod")
     
     # Versions
     VERSION: str = "0.1.0"
@@ -78,4 +111,4 @@ class PathConfig:
 
 
 # Exports principaux
-__all__ = ["DatabaseConfig", "AppConfig", "PathConfig", "PROJECT_ROOT"]
\ No newline at end of file
+__all__ = ["DatabaseConfig", "AppConfig", "PathConfig", "PROJECT_ROOT", "ensure_dir"]
\ No newline at end of file
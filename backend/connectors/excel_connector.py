@@ -2,12 +2,14 @@
 Connecteur pour lire des données depuis Excel
 """
 
-import pandas as pd
+from contextlib import contextmanager
+
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from loguru import logger
 
-from backend.core.excel_handler import excel_app_context
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ExcelConnector:
@@ -24,8 +26,85 @@ class ExcelConnector:
         
         if not self.excel_path.exists():
             raise FileNotFoundError(f"Fichier Excel introuvable : {excel_path}")
+        
+        self._table_index_cache: Optional[Dict[str, Tuple[str, str, str]]] = None
+    
+    @classmethod
+    @contextmanager
+    def _session(cls, path):
+        """
+        Context manager vers le classeur poolé d'excel_handler pour ce
+        fichier. Réutilise l'application Excel partagée du process sous
+        son verrou : une seconde instance xw.App concurrente provoquerait
+        les erreurs COM "enumeration rejected" que la sérialisation
+        d'excel_handler élimine.
+        """
+        from backend.core.excel_handler import _EXCEL_LOCK, excel_app_context
+
+        with _EXCEL_LOCK, excel_app_context(str(path), read_only=True) as (app, wb):
+            yield app, wb
+    
+    @property
+    def _table_index(self) -> Dict[str, Tuple[str, str, str]]:
+        """
+        Index {table_name_lower: (nom, feuille, plage)} des tableaux structurés,
+        construit en parsant le XML du fichier xlsx sans démarrer Excel.
+        """
+        if self._table_index_cache is None:
+            self._table_index_cache = self._build_table_index()
+        return self._table_index_cache
+    
+    def _build_table_index(self) -> Dict[str, Tuple[str, str, str]]:
+        """Scanne xl/tables/*.xml et les relations de feuilles en un seul passage"""
+        import zipfile
+        import xml.etree.ElementTree as ET
+        
+        NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+        NS_DOCREL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+        
+        index = {}
+        
+        with zipfile.ZipFile(self.excel_path) as zf:
+            names = set(zf.namelist())
+            
+            # Résolution nom de feuille -> fichier sheetN.xml
+            workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+            rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+            rel_targets = {r.get('Id'): r.get('Target') for r in rels}
+            
+            sheet_files = {}
+            for sheet in workbook.iter(f'{NS_MAIN}sheet'):
+                target = (rel_targets.get(sheet.get(f'{NS_DOCREL}id')) or '').lstrip('/')
+                if target and not target.startswith('xl/'):
+                    target = f"xl/{target}"
+                if target:
+                    sheet_files[target] = sheet.get('name')
+            
+            # Tables référencées par chaque feuille
+            for sheet_path, sheet_name in sheet_files.items():
+                prefix, _, filename = sheet_path.rpartition('/')
+                rels_path = f"{prefix}/_rels/{filename}.rels"
+                if rels_path not in names:
+                    continue
+                
+                for rel in ET.fromstring(zf.read(rels_path)):
+                    target = rel.get('Target', '')
+                    if 'tables/' not in target:
+                        continue
+                    
+                    table_path = f"xl/tables/{target.rsplit('/', 1)[-1]}"
+                    if table_path not in names:
+                        continue
+                    
+                    table = ET.fromstring(zf.read(table_path))
+                    name = table.get('displayName') or table.get('name')
+                    if name:
+                        index[name.lower()] = (name, sheet_name, table.get('ref'))
+        
+        logger.debug(f"Index des tableaux construit : {len(index)} tableaux")
+        return index
     
-    def read_table(self, table_name: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    def read_table(self, table_name: str, sheet_name: Optional[str] = None) -> "pd.DataFrame":
         """
         Lit un tableau structuré Excel.
         
@@ -38,7 +117,24 @@ class ExcelConnector:
         """
         logger.info(f"Lecture du tableau '{table_name}' depuis {self.excel_path.name}")
         
-        with excel_app_context(str(self.excel_path), visible=False, read_only=True) as (app, wb):
+        # Fast path : l'index XML localise le tableau sans démarrer Excel
+        try:
+            entry = self._table_index.get(table_name.strip().lower())
+        except Exception as e:
+            logger.debug(f"Index des tableaux illisible ({e}), lecture via Excel")
+            entry = None
+        
+        if entry:
+            name, table_sheet, ref = entry
+            if sheet_name is None or sheet_name == table_sheet:
+                try:
+                    df = self._read_table_range(table_sheet, ref)
+                    logger.success(f"Tableau '{table_name}' lu : {len(df)} lignes")
+                    return df
+                except Exception as e:
+                    logger.warning(f"Lecture directe de '{table_name}' échouée ({e}), lecture via Excel")
+        
+        with self._session(self.excel_path) as (app, wb):
             # Si sheet_name fourni, chercher directement
             if sheet_name:
                 try:
@@ -60,15 +156,30 @@ class ExcelConnector:
             
             raise ValueError(f"Tableau '{table_name}' introuvable dans {self.excel_path.name}")
     
-    def _read_table_from_sheet(self, sheet, table_name: str) -> pd.DataFrame:
-        """Lit un tableau depuis une feuille spécifique"""
-        # Rechercher le tableau structuré
-        table = None
-        for t in sheet.api.ListObjects:
-            if t.Name.strip().lower() == table_name.lower():
-                table = t
-                break
+    def _read_table_range(self, sheet_name: str, ref: str) -> "pd.DataFrame":
+        """Lit une plage de tableau (en-tête incluse) via pandas, sans Excel"""
+        import pandas as pd
+        from openpyxl.utils import range_boundaries, get_column_letter
+        
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
         
+        return pd.read_excel(
+            self.excel_path,
+            sheet_name=sheet_name,
+            skiprows=min_row - 1,
+            nrows=max_row - min_row,
+            usecols=f"{get_column_letter(min_col)}:{get_column_letter(max_col)}",
+            engine='openpyxl'
+        )
+    
+    def _read_table_from_sheet(self, sheet, table_name: str) -> "pd.DataFrame":
+        """Lit un tableau depuis une feuille spécifique"""
+        import pandas as pd
+        from backend.core.excel_handler import find_list_object
+
+        # Rechercher le tableau structuré (énumération unique, mise en cache)
+        table = find_list_object(sheet, table_name)
+
         if not table:
             raise ValueError(f"Tableau '{table_name}' non trouvé dans '{sheet.name}'")
         
@@ -76,11 +187,19 @@ class ExcelConnector:
         data_range = table.DataBodyRange
         if not data_range:
             return pd.DataFrame()
-        
-        # Convertir en DataFrame
-        values = sheet.range(data_range.Address).options(pd.DataFrame, index=False, header=True).value
-        
-        return values
+
+        # Un seul marshal COM (Value2 renvoie le SAFEARRAY 2D brut),
+        # l'inférence des types se fait ensuite localement
+        raw = sheet.range(data_range.Address).api.Value2
+        if not isinstance(raw, (list, tuple)):
+            raw = ((raw,),)
+        elif raw and not isinstance(raw[0], (list, tuple)):
+            raw = (raw,)
+
+        header = list(raw[0])
+        body = [list(row) for row in raw[1:]]
+
+        return pd.DataFrame(body, columns=header).convert_dtypes()
     
     def read_cell(self, sheet_name: str, cell: str) -> any:
         """
@@ -93,7 +212,7 @@ class ExcelConnector:
         Returns:
             Valeur de la cellule
         """
-        with excel_app_context(str(self.excel_path), visible=False, read_only=True) as (app, wb):
+        with self._session(self.excel_path) as (app, wb):
             sheet = wb.sheets[sheet_name]
             value = sheet.range(cell).value
             return value
@@ -105,9 +224,23 @@ class ExcelConnector:
         Returns:
             Dict {sheet_name: [table_names]}
         """
+        try:
+            index = self._table_index
+        except Exception as e:
+            logger.debug(f"Index des tableaux illisible ({e}), listing via Excel")
+            return self._list_tables_via_excel()
+        
+        tables_map = {}
+        for name, sheet_name, _ in index.values():
+            tables_map.setdefault(sheet_name, []).append(name)
+        
+        return tables_map
+    
+    def _list_tables_via_excel(self) -> Dict[str, List[str]]:
+        """Listing des tableaux via xlwings (fallback)"""
         tables_map = {}
         
-        with excel_app_context(str(self.excel_path), visible=False, read_only=True) as (app, wb):
+        with self._session(self.excel_path) as (app, wb):
             for sheet in wb.sheets:
                 sheet_tables = []
                 try:
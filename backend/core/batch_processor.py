@@ -3,15 +3,25 @@ Batch Processor - Gestion du traitement par batch pour les slides dynamiques
 Adapté de spirits_study pour KAIVAA Builder
 """
 
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
+import array
+import json
+import os
+from typing import Dict, List, Optional, Any, Callable, Iterator
+from dataclasses import dataclass, asdict
 from loguru import logger
 
+from backend.config import AppConfig
 from backend.core.excel_handler import (
     excel_app_context,
-    read_loop_table_count
+    find_list_object,
+    read_loop_table_count,
+    read_range_display_text
 )
 
+# Constantes XlCalculation
+XL_CALCULATION_MANUAL = -4135
+XL_CALCULATION_AUTOMATIC = -4105
+
 
 @dataclass
 class SlideAxis:
@@ -57,15 +67,54 @@ class BatchProcessor:
     Optimise les performances en regroupant les opérations Excel.
     """
     
-    def __init__(self, excel_path: str):
+    def __init__(self, excel_path: str, results_path: Optional[str] = None):
         """
         Initialise le batch processor.
         
         Args:
             excel_path: Chemin vers le fichier Excel
+            results_path: Fichier JSONL optionnel où streamer les résultats
+                          (évite de retenir tous les BatchResult en mémoire)
         """
         self.excel_path = excel_path
-        self.results: List[BatchResult] = []
+        self.results_path = results_path
+        # Layout colonnes (SoA) : trois tableaux parallèles compacts plutôt
+        # qu'une liste de dataclasses, agrégés ensuite en un passage vectorisé
+        self._axis_names: List[str] = []
+        self._success_flags = array.array('b')
+        self._param_values = array.array('i')
+    
+    def _record_result(self, result: BatchResult) -> None:
+        """
+        Comptabilise un résultat et le streame sur disque.
+        Seules trois colonnes compactes restent en mémoire, pas les
+        dataclasses ni leurs dicts de balises.
+        """
+        self._axis_names.append(result.axis_name)
+        self._success_flags.append(1 if result.success else 0)
+        self._param_values.append(result.parameter_value)
+        
+        if self.results_path:
+            try:
+                with open(self.results_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            except Exception as e:
+                logger.warning(f"Erreur écriture résultat de batch : {e}")
+    
+    def iter_results(self) -> Iterator[BatchResult]:
+        """
+        Relit paresseusement les résultats streamés sur disque.
+        
+        Yields:
+            BatchResult reconstruits depuis le fichier JSONL
+        """
+        if not self.results_path or not os.path.exists(self.results_path):
+            return
+        
+        with open(self.results_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield BatchResult(**json.loads(line))
     
     def validate_axis_config(self, axes: Dict[str, SlideAxis]) -> bool:
         """
@@ -81,25 +130,33 @@ class BatchProcessor:
             logger.error("Configuration des axes vide")
             return False
         
-        errors = []
-        
+        # Validation et log en un seul passage ; en production on
+        # s'arrête à la première erreur, en dev on les liste toutes
+        has_err = False
+
+        def _report(message: str) -> None:
+            nonlocal has_err
+            if not has_err:
+                logger.error("Erreurs configuration axes :")
+            has_err = True
+            logger.error(f"  - {message}")
+
         for axis_name, axis in axes.items():
-            if not isinstance(axis, SlideAxis):
-                errors.append(f"Axe {axis_name} doit être une instance de SlideAxis")
-                continue
-                
-            if not axis.slides:
-                errors.append(f"Axe {axis_name} : liste de slides vide")
-                
-            if not axis.loop_id:
-                errors.append(f"Axe {axis_name} : loop_id manquant")
-        
-        if errors:
-            logger.error("Erreurs configuration axes :")
-            for error in errors:
-                logger.error(f"  - {error}")
+            if type(axis) is not SlideAxis:
+                _report(f"Axe {axis_name} doit être une instance de SlideAxis")
+            else:
+                if not axis.slides:
+                    _report(f"Axe {axis_name} : liste de slides vide")
+
+                if not axis.loop_id:
+                    _report(f"Axe {axis_name} : loop_id manquant")
+
+            if has_err and AppConfig.is_production():
+                return False
+
+        if has_err:
             return False
-        
+
         logger.info(f"Configuration {len(axes)} axes validée")
         return True
     
@@ -139,8 +196,6 @@ class BatchProcessor:
         Returns:
             Liste des résultats de batch
         """
-        import time
-        
         logger.info(f"Traitement par batch de l'axe '{axis.name}'")
         
         param_count = self.get_axis_parameters_count(axis)
@@ -153,154 +208,259 @@ class BatchProcessor:
         
         # Ouverture d'Excel UNE SEULE FOIS pour tout l'axe
         with excel_app_context(self.excel_path) as (app, wb):
-            for param_value in range(1, param_count + 1):
+            original_flags = self._set_performance_flags(app)
+            try:
+                # Résolution unique des tableaux Loop/Balises : évite de
+                # ré-énumérer les ListObjects à chaque itération
                 try:
-                    logger.debug(f"    → Paramètre {param_value}/{param_count}")
-                    
-                    # Injection du paramètre dans la session ouverte
-                    self._update_loop_table_iteration_in_session(
-                        wb, axis.sheet_name, axis.loop_id, param_value
-                    )
-                    
-                    # Forcer le recalcul Excel
-                    wb.app.calculate()
-                    wb.save()
-                    
-                    # Délai pour laisser PowerPoint récupérer les changements
-                    time.sleep(1.0)
-                    
-                    # Lecture des balises fraîches
-                    replacements = self._read_replacement_tags_from_session(wb)
-                    
-                    # Appel du callback pour traiter les slides
+                    loop_sht = wb.sheets[axis.sheet_name]
+                    loop_tbl = self._find_list_object(loop_sht, "Loop")
+                    loop_rows = self._build_loop_row_map(loop_sht, loop_tbl)
+                    if axis.loop_id not in loop_rows:
+                        raise ValueError(f"Loop ID '{axis.loop_id}' non trouvé dans le tableau Loop")
+                    loop_row_index = loop_rows[axis.loop_id]
+                    balises_sht = wb.sheets["Balises"]
+                    balises_tbl = self._find_list_object(balises_sht, "Balises")
+                except Exception as e:
+                    logger.error(f"Erreur résolution tableaux pour axe '{axis.name}' : {e}")
+                    return batch_results
+
+                for param_value in range(1, param_count + 1):
                     try:
-                        processor_callback(param_value, replacements, axis.slides)
+                        # Formatage paresseux : la chaîne n'est construite
+                        # que si le niveau DEBUG est actif
+                        logger.opt(lazy=True).debug(
+                            "    → Paramètre {}/{}",
+                            lambda: param_value, lambda: param_count
+                        )
+
+                        # Injection du paramètre dans la session ouverte
+                        self._update_loop_table_iteration_in_session(
+                            loop_tbl, loop_row_index, param_value
+                        )
+
+                        # Recalcul ciblé des seules feuilles dépendant de la boucle
+                        self._calculate_axis_sheets(wb, axis.sheet_name)
+                        self._wait_for_calculation_done(wb)
+
+                        # Lecture des balises fraîches
+                        replacements = self._read_replacement_tags_from_session(balises_sht, balises_tbl)
+                    
+                        # Appel du callback pour traiter les slides
+                        try:
+                            processor_callback(param_value, replacements, axis.slides)
                         
-                        batch_results.append(BatchResult(
-                            axis_name=axis.name,
-                            parameter_value=param_value,
-                            slide_count=len(axis.slides),
-                            replacements=replacements,
-                            success=True
-                        ))
+                            batch_results.append(BatchResult(
+                                axis_name=axis.name,
+                                parameter_value=param_value,
+                                slide_count=len(axis.slides),
+                                replacements=replacements,
+                                success=True
+                            ))
                     
-                    except Exception as callback_error:
-                        logger.error(f"Erreur callback pour paramètre {param_value} : {callback_error}")
+                        except Exception as callback_error:
+                            logger.error(f"Erreur callback pour paramètre {param_value} : {callback_error}")
+                            batch_results.append(BatchResult(
+                                axis_name=axis.name,
+                                parameter_value=param_value,
+                                slide_count=len(axis.slides),
+                                replacements=replacements,
+                                success=False,
+                                error_message=str(callback_error)
+                            ))
+                
+                    except Exception as e:
+                        logger.error(f"Erreur traitement paramètre {param_value} : {e}")
                         batch_results.append(BatchResult(
                             axis_name=axis.name,
                             parameter_value=param_value,
                             slide_count=len(axis.slides),
-                            replacements=replacements,
+                            replacements={},
                             success=False,
-                            error_message=str(callback_error)
+                            error_message=str(e)
                         ))
-                
+
+                # Sauvegarde unique en fin d'axe : les balises sont lues dans
+                # la session ouverte, l'écriture disque par itération est inutile
+                try:
+                    wb.save()
                 except Exception as e:
-                    logger.error(f"Erreur traitement paramètre {param_value} : {e}")
-                    batch_results.append(BatchResult(
-                        axis_name=axis.name,
-                        parameter_value=param_value,
-                        slide_count=len(axis.slides),
-                        replacements={},
-                        success=False,
-                        error_message=str(e)
-                    ))
-        
+                    logger.warning(f"Erreur sauvegarde classeur en fin d'axe : {e}")
+
+            finally:
+                self._restore_performance_flags(app, original_flags)
+
         successful = len([r for r in batch_results if r.success])
         logger.info(f"Axe '{axis.name}' : {successful}/{len(batch_results)} paramètres traités avec succès")
         
-        self.results.extend(batch_results)
+        for result in batch_results:
+            self._record_result(result)
         return batch_results
     
+    def _set_performance_flags(self, app) -> Dict[str, Any]:
+        """
+        Désactive affichage, événements et recalcul automatique pendant le batch.
+
+        Args:
+            app: Application Excel ouverte
+
+        Returns:
+            Dict des valeurs d'origine à restaurer
+        """
+        originals = {}
+        try:
+            api = app.api
+            originals = {
+                "ScreenUpdating": api.ScreenUpdating,
+                "EnableEvents": api.EnableEvents,
+                "DisplayAlerts": api.DisplayAlerts,
+                "Calculation": api.Calculation,
+            }
+            api.ScreenUpdating = False
+            api.EnableEvents = False
+            api.DisplayAlerts = False
+            api.Calculation = XL_CALCULATION_MANUAL
+            logger.debug("Flags de performance Excel activés")
+        except Exception as e:
+            logger.debug(f"Flags de performance Excel non appliqués : {e}")
+        return originals
+
+    def _restore_performance_flags(self, app, originals: Dict[str, Any]) -> None:
+        """Restaure les réglages Excel modifiés par _set_performance_flags."""
+        try:
+            api = app.api
+            for name, value in originals.items():
+                setattr(api, name, value)
+        except Exception as e:
+            logger.debug(f"Erreur restauration flags Excel : {e}")
+
+    def _calculate_axis_sheets(self, wb, sheet_name: str) -> None:
+        """
+        Recalcule uniquement les feuilles dépendant de la valeur de boucle
+        (feuille du tableau Loop + Balises) au lieu du classeur entier.
+        """
+        for name in {sheet_name, "Balises"}:
+            try:
+                wb.sheets[name].api.Calculate()
+            except Exception as e:
+                logger.debug(f"Recalcul feuille '{name}' impossible : {e}")
+
+    def _wait_for_calculation_done(self, wb, timeout: float = 10.0) -> None:
+        """
+        Attend la fin effective du recalcul Excel (remplace le sleep arbitraire).
+
+        Args:
+            wb: Workbook Excel ouvert
+            timeout: Durée maximale d'attente en secondes
+        """
+        import time
+
+        try:
+            wb.app.api.CalculateUntilAsyncQueriesDone()
+        except Exception:
+            pass
+
+        # CalculationState : 0 = xlDone
+        deadline = time.monotonic() + timeout
+        try:
+            while wb.app.api.CalculationState != 0:
+                if time.monotonic() > deadline:
+                    logger.warning("Timeout d'attente du recalcul Excel")
+                    break
+                time.sleep(0.01)
+        except Exception:
+            # CalculationState indisponible (pas de session interactive) : on continue
+            pass
+
+    def _find_list_object(self, sht, table_name: str):
+        """
+        Résout un tableau structuré par nom sur une feuille.
+
+        Args:
+            sht: Feuille Excel ouverte
+            table_name: Nom du tableau recherché
+
+        Returns:
+            Handle COM du ListObject
+        """
+        table = find_list_object(sht, table_name)
+        if table is None:
+            raise ValueError(f"Tableau '{table_name}' introuvable dans '{sht.name}'")
+        return table
+
+    def _build_loop_row_map(self, sht, loop_tbl) -> Dict[str, int]:
+        """
+        Mappe chaque ID du tableau Loop vers son index de ligne (1-based).
+        La colonne ID est lue en un seul appel COM, le dict est construit
+        localement : les résolutions suivantes sont de simples lookups.
+        """
+        id_col = sht.range(loop_tbl.ListColumns(1).DataBodyRange.Address).value
+        if not isinstance(id_col, list):
+            id_col = [id_col]
+
+        return {str(v).strip(): i + 1 for i, v in enumerate(id_col) if v}
+
     def _update_loop_table_iteration_in_session(
-        self, 
-        wb, 
-        sheet_name: str, 
-        loop_id: str, 
+        self,
+        loop_tbl,
+        row_index: int,
         iteration_value: int
     ) -> None:
         """
-        Met à jour la valeur d'itération dans le tableau Loop dans une session Excel ouverte.
-        
+        Écrit la valeur d'itération via le handle de tableau résolu en amont.
+
         Args:
-            wb: Workbook Excel ouvert
-            sheet_name: Nom de la feuille
-            loop_id: ID de la boucle
+            loop_tbl: ListObject Loop mis en cache
+            row_index: Index (1-based) de la ligne dans le tableau
             iteration_value: Nouvelle valeur d'itération
         """
         try:
-            sht = wb.sheets[sheet_name]
-            
-            # Recherche du tableau Loop
-            table = None
-            for t in sht.api.ListObjects:
-                if t.Name.strip().lower() == "loop":
-                    table = t
-                    break
-            
-            if not table:
-                raise ValueError(f"Tableau 'Loop' introuvable dans '{sheet_name}'")
-            
-            # Recherche et mise à jour de la ligne
-            for row in table.DataBodyRange.Rows:
-                id_value = row.Columns(1).Value
-                if id_value and str(id_value).strip() == loop_id:
-                    row.Columns(2).Value = iteration_value
-                    logger.debug(f"Loop {loop_id} mis à jour : itération = {iteration_value}")
-                    return
-            
-            raise ValueError(f"Loop ID '{loop_id}' non trouvé dans le tableau Loop")
-        
+            # Une seule écriture COM, aucune recherche
+            loop_tbl.ListColumns(2).DataBodyRange.Cells(row_index).Value = iteration_value
+            logger.opt(lazy=True).debug(
+                "Loop ligne {} mise à jour : itération = {}",
+                lambda: row_index, lambda: iteration_value
+            )
         except Exception as e:
             raise RuntimeError(f"Erreur mise à jour tableau Loop : {e}")
-    
+
     def _read_replacement_tags_from_session(
-        self, 
-        wb, 
-        sheet_name: str = "Balises", 
-        table_name: str = "Balises"
+        self,
+        sht,
+        table
     ) -> Dict[str, str]:
         """
-        Lit les balises depuis une session Excel déjà ouverte.
-        
+        Lit les balises depuis un tableau résolu dans une session Excel ouverte.
+
         Args:
-            wb: Workbook Excel ouvert
-            sheet_name: Nom de la feuille
-            table_name: Nom du tableau
-            
+            sht: Feuille Balises ouverte
+            table: ListObject Balises mis en cache
+
         Returns:
             Dict des balises
         """
+        from itertools import compress
+
         try:
-            sht = wb.sheets[sheet_name]
-        except Exception:
-            raise ValueError(f"Feuille '{sheet_name}' introuvable")
-        
-        # Recherche du tableau
-        table = None
-        try:
-            for t in sht.api.ListObjects:
-                if t.Name.strip().lower() == table_name.lower():
-                    table = t
-                    break
-        except Exception as e:
-            raise RuntimeError(f"Erreur accès tableaux : {e}")
-        
-        if not table:
-            raise ValueError(f"Tableau '{table_name}' introuvable dans '{sheet_name}'")
-        
-        replacements = {}
-        try:
-            for row in table.DataBodyRange.Rows:
-                balise = row.Columns(1).Value
-                valeur = row.Columns(3).Text
-                if balise and valeur is not None:
-                    replacements[balise] = str(valeur)
+            data_range = table.DataBodyRange
+            if data_range is None:
+                return {}
+
+            # Texte affiché lu en un seul appel COM (Value(11) via le
+            # helper) : le format Excel des valeurs est conservé, là où
+            # Value2 renverrait "2025.0" pour une année ou un serial de date
+            rows = read_range_display_text(sht, data_range)
+
+            # Transposition unique puis construction du dict via les
+            # builtins C (zip/compress) plutôt qu'une boucle Python
+            cols = list(zip(*rows))
+            keys, vals = cols[0], cols[2]
+            mask = [bool(k) and bool(v) for k, v in zip(keys, vals)]
+
+            return dict(zip(compress(keys, mask), compress(vals, mask)))
         except Exception as e:
             raise RuntimeError(f"Erreur lecture balises : {e}")
-        
-        return replacements
-    
+
     def get_processing_summary(self) -> Dict[str, Any]:
         """
         Retourne un résumé du traitement effectué.
@@ -308,20 +468,25 @@ class BatchProcessor:
         Returns:
             Dict avec statistiques du traitement
         """
-        if not self.results:
+        import numpy as np
+        
+        if not self._success_flags:
             return {"total": 0, "success": 0, "errors": 0, "axes": []}
         
-        total = len(self.results)
-        success = len([r for r in self.results if r.success])
+        flags = np.frombuffer(self._success_flags, dtype=np.int8)
+        total = int(flags.size)
+        success = int(flags.sum())
         errors = total - success
         
+        # Agrégation par axe sur les colonnes contiguës
+        names = np.asarray(self._axis_names)
         axes_summary = {}
-        for result in self.results:
-            if result.axis_name not in axes_summary:
-                axes_summary[result.axis_name] = {"total": 0, "success": 0}
-            axes_summary[result.axis_name]["total"] += 1
-            if result.success:
-                axes_summary[result.axis_name]["success"] += 1
+        for name in np.unique(names):
+            mask = names == name
+            axes_summary[str(name)] = {
+                "total": int(mask.sum()),
+                "success": int(flags[mask].sum())
+            }
         
         return {
             "total": total,
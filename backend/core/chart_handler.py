@@ -3,12 +3,19 @@ Chart Handler - Conversion de graphiques Excel en images
 """
 
 import os
+import shutil
+import tempfile
 from pathlib import Path
 from typing import List, Dict, Optional
 from loguru import logger
 
+from backend.config import ensure_dir
 from backend.core.excel_handler import excel_app_context
 
+# Caractères interdits dans les noms de fichiers : table de traduction
+# précalculée, appliquée en un seul passage C par str.translate
+_UNSAFE_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
 
 class ChartExporter:
     """Exporte les graphiques Excel en images PNG"""
@@ -26,32 +33,213 @@ class ChartExporter:
         if output_dir:
             self.output_dir = Path(output_dir)
         else:
-            import tempfile
             self.output_dir = Path(tempfile.gettempdir()) / "kaivaa_charts"
-        
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        ensure_dir(self.output_dir)
     
     def export_all_charts(self) -> Dict[str, List[str]]:
         """
         Exporte tous les graphiques du fichier Excel.
-        
+        Tente d'abord le rendu sans Excel (openpyxl + matplotlib),
+        et retombe sur l'export COM natif si nécessaire.
+
         Returns:
             Dict {sheet_name: [liste des chemins images]}
         """
         logger.info(f"Export des graphiques depuis {Path(self.excel_path).name}")
-        
-        charts_map = {}
-        
+
+        charts_map = self._export_all_charts_without_excel()
+        if charts_map is not None:
+            total_charts = sum(len(charts) for charts in charts_map.values())
+            logger.success(f"{total_charts} graphiques exportés (sans Excel)")
+            return charts_map
+
+        # Énumération des feuilles via une session Excel courte
         with excel_app_context(self.excel_path, visible=False, read_only=True) as (app, wb):
-            for sheet in wb.sheets:
-                sheet_charts = self._export_sheet_charts(sheet, sheet.name)
+            sheet_names = [sheet.name for sheet in wb.sheets]
+
+        charts_map = {}
+
+        if sheet_names:
+            # Une instance Excel par process : multiprocessing évite la
+            # contention STA/RPC qui rend le multithreading COM contre-productif
+            pool_size = min(os.cpu_count() or 1, len(sheet_names))
+            args = [(self.excel_path, name, str(self.output_dir)) for name in sheet_names]
+
+            if pool_size > 1:
+                from multiprocessing import Pool
+                with Pool(pool_size) as pool:
+                    results = pool.starmap(_export_sheet_charts_worker, args)
+            else:
+                results = [_export_sheet_charts_worker(*arg) for arg in args]
+
+            for name, sheet_charts in zip(sheet_names, results):
                 if sheet_charts:
-                    charts_map[sheet.name] = sheet_charts
-        
+                    charts_map[name] = sheet_charts
+
         total_charts = sum(len(charts) for charts in charts_map.values())
         logger.success(f"{total_charts} graphiques exportés")
-        
+
+        return charts_map
+
+    def _export_all_charts_without_excel(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Rendu des graphiques via openpyxl + matplotlib, sans démarrer Excel.
+
+        Returns:
+            Dict {sheet_name: [chemins images]} si tous les graphiques ont pu
+            être rendus, None pour retomber sur l'export COM natif
+        """
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+            import openpyxl
+        except ImportError:
+            logger.debug("matplotlib indisponible, export via Excel")
+            return None
+
+        try:
+            # read_only=True ne charge pas les graphiques : lecture classique
+            # avec data_only pour récupérer les valeurs calculées
+            wb = openpyxl.load_workbook(self.excel_path, data_only=True)
+        except Exception as e:
+            logger.warning(f"Lecture openpyxl impossible ({e}), export via Excel")
+            return None
+
+        charts_map = {}
+
+        try:
+            for ws in wb.worksheets:
+                sheet_charts = []
+
+                for i, chart in enumerate(getattr(ws, '_charts', []), 1):
+                    safe_sheet_name = self._sanitize_filename(ws.title)
+                    image_name = f"{safe_sheet_name}_chart_{i}.png"
+                    image_path = self.output_dir / image_name
+
+                    if not self._render_chart_matplotlib(wb, chart, image_path, plt):
+                        logger.debug(f"Graphique {i} de '{ws.title}' non supporté, export via Excel")
+                        return None
+
+                    sheet_charts.append(str(image_path))
+                    logger.debug(f"Graphique {i} de '{ws.title}' rendu : {image_name}")
+
+                if sheet_charts:
+                    charts_map[ws.title] = sheet_charts
+        finally:
+            wb.close()
+
         return charts_map
+
+    def _render_chart_matplotlib(self, wb, chart, image_path: Path, plt) -> bool:
+        """
+        Rend un graphique openpyxl en PNG via matplotlib.
+
+        Returns:
+            True si le type de graphique est supporté et rendu avec succès
+        """
+        chart_type = type(chart).__name__
+        if chart_type not in ("BarChart", "LineChart", "PieChart", "AreaChart", "ScatterChart"):
+            return False
+
+        fig, ax = plt.subplots(figsize=(8, 4.5))
+
+        try:
+            for ser in chart.series:
+                values = [v for v in self._read_series_ref(wb, ser.val) if v is not None]
+                if not values:
+                    continue
+
+                categories = self._read_series_ref(wb, ser.cat)
+                if len(categories) != len(values):
+                    categories = list(range(1, len(values) + 1))
+
+                label = None
+                if ser.tx is not None and ser.tx.strRef is not None:
+                    titles = self._read_ref(wb, ser.tx.strRef.f)
+                    label = str(titles[0]) if titles else None
+
+                if chart_type == "PieChart":
+                    ax.pie(values, labels=[str(c) for c in categories], autopct='%1.1f%%')
+                elif chart_type == "BarChart":
+                    ax.bar([str(c) for c in categories], values, label=label)
+                elif chart_type == "AreaChart":
+                    ax.fill_between(range(len(values)), values, label=label, alpha=0.6)
+                elif chart_type == "ScatterChart":
+                    ax.scatter(categories, values, label=label)
+                else:
+                    ax.plot([str(c) for c in categories], values, label=label)
+
+            title = self._extract_chart_title(chart)
+            if title:
+                ax.set_title(title)
+
+            if chart_type != "PieChart" and ax.get_legend_handles_labels()[1]:
+                ax.legend()
+
+            fig.savefig(str(image_path), dpi=150, bbox_inches="tight")
+            return True
+
+        except Exception as e:
+            logger.debug(f"Rendu matplotlib échoué : {e}")
+            return False
+
+        finally:
+            plt.close(fig)
+
+    def _read_series_ref(self, wb, source) -> List:
+        """Matérialise les valeurs d'une source de série (numRef ou strRef)"""
+        if source is None:
+            return []
+
+        ref = getattr(source, 'numRef', None) or getattr(source, 'strRef', None)
+        if ref is None:
+            return []
+
+        return self._read_ref(wb, ref.f)
+
+    def _read_ref(self, wb, ref: Optional[str]) -> List:
+        """Lit une référence de plage (ex: 'Feuille'!$B$2:$B$10) en liste plate"""
+        if not ref:
+            return []
+
+        try:
+            sheet_part, _, cells = ref.rpartition('!')
+            ws = wb[sheet_part.strip("'")]
+
+            data = ws[cells.replace('$', '')]
+            if not isinstance(data, tuple):
+                return [data.value]
+
+            values = []
+            for row in data:
+                if isinstance(row, tuple):
+                    values.extend(cell.value for cell in row)
+                else:
+                    values.append(row.value)
+            return values
+        except Exception as e:
+            logger.debug(f"Lecture référence '{ref}' impossible : {e}")
+            return []
+
+    def _extract_chart_title(self, chart) -> Optional[str]:
+        """Extrait le titre texte d'un graphique openpyxl"""
+        try:
+            title = chart.title
+            if title is None:
+                return None
+            if isinstance(title, str):
+                return title
+
+            parts = []
+            for para in title.tx.rich.p:
+                for run in (para.r or []):
+                    if run.t:
+                        parts.append(run.t)
+            return " ".join(parts) if parts else None
+        except Exception:
+            return None
     
     def export_chart_by_name(self, chart_name: str, sheet_name: Optional[str] = None) -> Optional[str]:
         """
@@ -84,43 +272,6 @@ class ChartExporter:
             logger.warning(f"Graphique '{chart_name}' introuvable")
             return None
     
-    def _export_sheet_charts(self, sheet, sheet_name: str) -> List[str]:
-        """Exporte tous les graphiques d'une feuille"""
-        exported_paths = []
-        
-        try:
-            charts = sheet.api.ChartObjects()
-            chart_count = charts.Count
-            
-            if chart_count == 0:
-                return []
-            
-            logger.debug(f"Export de {chart_count} graphiques depuis '{sheet_name}'")
-            
-            for i in range(1, chart_count + 1):
-                try:
-                    chart = charts(i)
-                    chart_name = chart.Name
-                    
-                    safe_sheet_name = self._sanitize_filename(sheet_name)
-                    safe_chart_name = self._sanitize_filename(chart_name)
-                    image_name = f"{safe_sheet_name}_{safe_chart_name}_{i}.png"
-                    image_path = self.output_dir / image_name
-                    
-                    chart.Chart.Export(str(image_path))
-                    exported_paths.append(str(image_path))
-                    
-                    logger.debug(f"Graphique '{chart_name}' exporté : {image_path.name}")
-                
-                except Exception as e:
-                    logger.warning(f"Erreur export graphique {i} de '{sheet_name}' : {e}")
-                    continue
-        
-        except Exception as e:
-            logger.warning(f"Erreur accès graphiques de '{sheet_name}' : {e}")
-        
-        return exported_paths
-    
     def _export_named_chart(self, sheet, chart_name: str, sheet_name: str) -> Optional[str]:
         """Exporte un graphique spécifique par son nom"""
         try:
@@ -146,16 +297,69 @@ class ChartExporter:
     
     def _sanitize_filename(self, name: str) -> str:
         """Nettoie un nom pour l'utiliser dans un nom de fichier"""
-        import re
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', name)
-        return sanitized[:50]
+        return _sanitize_filename(name)
     
     def cleanup(self) -> None:
         """Supprime les images exportées"""
         try:
-            import shutil
             if self.output_dir.exists():
                 shutil.rmtree(self.output_dir)
                 logger.debug(f"Dossier de graphiques nettoyé : {self.output_dir}")
         except Exception as e:
-            logger.warning(f"Erreur nettoyage graphiques : {e}")
\ No newline at end of file
+            logger.warning(f"Erreur nettoyage graphiques : {e}")
+
+def _sanitize_filename(name: str) -> str:
+    """Nettoie un nom pour l'utiliser dans un nom de fichier"""
+    return name.translate(_UNSAFE_TRANS)[:50]
+
+
+def _export_sheet_charts_worker(excel_path: str, sheet_name: str, output_dir: str) -> List[str]:
+    """
+    Exporte tous les graphiques d'une feuille dans une session Excel dédiée.
+    Fonction module-level pour être picklable par multiprocessing.
+
+    Args:
+        excel_path: Chemin vers le fichier Excel
+        sheet_name: Nom de la feuille à traiter
+        output_dir: Dossier de sortie pour les images
+
+    Returns:
+        Liste des chemins des images exportées
+    """
+    exported_paths = []
+    output_path = Path(output_dir)
+
+    try:
+        with excel_app_context(excel_path, visible=False, read_only=True) as (app, wb):
+            sheet = wb.sheets[sheet_name]
+            charts = sheet.api.ChartObjects()
+            chart_count = charts.Count
+
+            if chart_count == 0:
+                return []
+
+            logger.debug(f"Export de {chart_count} graphiques depuis '{sheet_name}'")
+
+            for i in range(1, chart_count + 1):
+                try:
+                    chart = charts(i)
+                    chart_name = chart.Name
+
+                    safe_sheet_name = _sanitize_filename(sheet_name)
+                    safe_chart_name = _sanitize_filename(chart_name)
+                    image_name = f"{safe_sheet_name}_{safe_chart_name}_{i}.png"
+                    image_path = output_path / image_name
+
+                    chart.Chart.Export(str(image_path))
+                    exported_paths.append(str(image_path))
+
+                    logger.debug(f"Graphique '{chart_name}' exporté : {image_path.name}")
+
+                except Exception as e:
+                    logger.warning(f"Erreur export graphique {i} de '{sheet_name}' : {e}")
+                    continue
+
+    except Exception as e:
+        logger.warning(f"Erreur accès graphiques de '{sheet_name}' : {e}")
+
+    return exported_paths
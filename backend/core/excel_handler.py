@@ -3,7 +3,12 @@ Excel Handler - Gestion des opérations Excel via xlwings
 Adapté de spirits_study pour KAIVAA Builder
 """
 
+import atexit
+import functools
+import json
 import os
+import re
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 from typing import Dict, Optional, List, Tuple, Any
@@ -11,43 +16,274 @@ import xlwings as xw
 import pandas as pd
 from loguru import logger
 
+try:
+    from pywintypes import com_error as _COMError
+except ImportError:  # hors Windows (tests, outillage)
+    _COMError = ()
+
+# Pool de classeurs ouverts :
+# {chemin_absolu: [app, wb, refcount, read_only, flags_origine]}.
+# Amortit le démarrage d'Excel (~3-5 s) sur tous les appels successifs
+# visant le même fichier.
+_WORKBOOK_POOL: Dict[str, list] = {}
+_POOL_LOCK = threading.Lock()
+
+# Sérialise les opérations Excel : les erreurs COM "enumeration rejected"
+# viennent d'instances xw.App concurrentes, pas de flakiness à retenter
+_EXCEL_LOCK = threading.RLock()
+
+
+def _is_com_error(e: Exception) -> bool:
+    """Détecte une erreur COM transitoire justifiant une réouverture."""
+    if _COMError and isinstance(e, _COMError):
+        return True
+    msg = str(e).lower()
+    return any(keyword in msg for keyword in [
+        "enumeration", "rejeté", "rejected", "automation", "com_error"
+    ])
+
+# Constante XlCalculation
+XL_CALCULATION_MANUAL = -4135
+
+# Lecture sans Excel pour les fonctions en lecture pure (désactivable
+# via KAIVAA_FAST_READ=0 pour revenir au comportement COM historique)
+_FAST_READ = os.environ.get("KAIVAA_FAST_READ", "1") == "1"
+
+# Motif HYPERLINK précompilé : une seule alternative couvre l'URL entre
+# guillemets et la référence nue en premier argument
+_HYPERLINK_RE = re.compile(
+    r'HYPERLINK\s*\(\s*(?:"([^"]+)"[,;]|([^,;)]+)[,;)])',
+    re.IGNORECASE
+)
+
+
+def _apply_performance_flags(app) -> Dict[str, Any]:
+    """
+    Coupe affichage, événements, alertes et recalcul automatique : chaque
+    écriture de cellule déclencherait sinon un recalcul des feuilles de
+    formules et un redessin d'écran.
+
+    Returns:
+        Dict des valeurs d'origine à restaurer avant fermeture
+    """
+    originals: Dict[str, Any] = {}
+    try:
+        api = app.api
+        originals = {
+            "ScreenUpdating": api.ScreenUpdating,
+            "EnableEvents": api.EnableEvents,
+            "DisplayAlerts": api.DisplayAlerts,
+            "Calculation": api.Calculation,
+        }
+        api.ScreenUpdating = False
+        api.EnableEvents = False
+        api.DisplayAlerts = False
+        api.Calculation = XL_CALCULATION_MANUAL
+    except Exception as e:
+        logger.debug(f"Flags de performance Excel non appliqués : {e}")
+    return originals
+
+
+# Application Excel partagée : une seule CoCreateInstance pour tout le
+# process, les classeurs s'ouvrent et se ferment dessus
+_APP: Optional[Any] = None
+_APP_FLAGS: Dict[str, Any] = {}
+
+
+def _get_app():
+    """Retourne l'application Excel partagée, créée paresseusement."""
+    global _APP, _APP_FLAGS
+    if _APP is None:
+        logger.debug("Démarrage de l'application Excel partagée")
+        _APP = xw.App(visible=False, add_book=False)
+        _APP_FLAGS = _apply_performance_flags(_APP)
+    return _APP
+
+
+def _quit_shared_app() -> None:
+    """Restaure les flags et ferme l'application Excel partagée."""
+    global _APP
+    if _APP is None:
+        return
+    try:
+        for attr, value in _APP_FLAGS.items():
+            setattr(_APP.api, attr, value)
+    except Exception:
+        pass
+    try:
+        _APP.quit()
+        logger.debug("Application Excel partagée fermée")
+    except Exception:
+        pass
+    _APP = None
+
+
+def acquire_workbook(path: str, visible: bool = False, read_only: bool = False):
+    """
+    Récupère (ou ouvre) le classeur poolé pour ce chemin.
+
+    Args:
+        path: Chemin vers le fichier Excel
+        visible: Si True, ouvre dans une application dédiée visible
+        read_only: Si True, une ouverture en lecture seule suffit
+
+    Returns:
+        Tuple[xlwings.App, xlwings.Book]: Application et workbook Excel
+    """
+    key = str(Path(path).resolve())
+
+    with _POOL_LOCK:
+        entry = _WORKBOOK_POOL.get(key)
+
+        # Un classeur poolé en lecture seule ne peut pas servir un écrivain :
+        # on le ferme et on rouvre en écriture
+        if entry is not None and entry[3] and not read_only:
+            _close_entry(key, entry)
+            entry = None
+
+        if entry is None:
+            logger.debug(f"Ouverture Excel: {key}")
+            # visible=True reste une application éphémère dédiée ;
+            # le cas standard réutilise l'application partagée
+            app = xw.App(visible=True) if visible else _get_app()
+            wb = app.books.open(key, read_only=read_only)
+            entry = _WORKBOOK_POOL[key] = [app, wb, 0, read_only]
+
+        entry[2] += 1
+        return entry[0], entry[1]
+
+
+def release_workbook(path: str) -> None:
+    """Rend le classeur au pool (il reste ouvert pour les appels suivants)."""
+    key = str(Path(path).resolve())
+
+    with _POOL_LOCK:
+        entry = _WORKBOOK_POOL.get(key)
+        if entry is not None and entry[2] > 0:
+            entry[2] -= 1
+
+
+def flush_and_close(path: str) -> None:
+    """
+    Ferme le classeur poolé pour ce chemin (fin de pipeline ou erreur COM).
+    Sans effet si le fichier n'est pas dans le pool.
+    """
+    key = str(Path(path).resolve())
+
+    with _POOL_LOCK:
+        entry = _WORKBOOK_POOL.pop(key, None)
+        if entry is not None:
+            _close_entry(key, entry)
+
+
+def _close_entry(key: str, entry: list) -> None:
+    """Ferme une entrée du pool (verrou déjà détenu par l'appelant)."""
+    _WORKBOOK_POOL.pop(key, None)
+    # Les handles ListObject du classeur fermé deviennent invalides
+    _LISTOBJECT_CACHE.clear()
+    app, wb = entry[0], entry[1]
+    try:
+        wb.close()
+        logger.debug("Workbook fermé")
+    except Exception:
+        pass
+    # L'application partagée survit aux fermetures de classeurs ;
+    # seules les applications éphémères (visible=True) sont quittées
+    if app is not _APP:
+        try:
+            app.quit()
+            logger.debug("Application Excel fermée")
+        except Exception:
+            pass
+
+
+def _close_workbook_pool() -> None:
+    """Ferme classeurs poolés et application partagée (enregistré via atexit)."""
+    with _POOL_LOCK:
+        for key, entry in list(_WORKBOOK_POOL.items()):
+            _close_entry(key, entry)
+    _quit_shared_app()
+
+
+atexit.register(_close_workbook_pool)
+
 
 @contextmanager
 def excel_app_context(path: str, visible: bool = False, read_only: bool = False):
     """
-    Context manager pour gérer proprement les ressources Excel.
-    
+    Context manager vers le classeur poolé pour ce chemin.
+    Le classeur reste ouvert à la sortie (fermeture via flush_and_close
+    en fin de pipeline ou via atexit) ; en cas d'erreur il est retiré
+    du pool et fermé.
+
     Args:
         path: Chemin vers le fichier Excel
         visible: Si True, affiche l'application Excel
         read_only: Si True, ouvre en lecture seule
-        
+
     Yields:
         Tuple[xlwings.App, xlwings.Book]: Application et workbook Excel
     """
-    app = None
-    wb = None
     try:
-        logger.debug(f"Ouverture Excel: {path}")
-        app = xw.App(visible=visible)
-        wb = app.books.open(path, read_only=read_only)  # <- AJOUTER read_only ici
-        yield app, wb
+        app, wb = acquire_workbook(path, visible=visible, read_only=read_only)
     except Exception as e:
         logger.error(f"Erreur ouverture Excel: {e}")
         raise RuntimeError(f"Erreur lors de l'ouverture d'Excel ({path}): {e}")
+
+    try:
+        yield app, wb
+    except Exception:
+        flush_and_close(path)
+        raise
     finally:
-        if wb is not None:
-            try:
-                wb.close()
-                logger.debug("Workbook fermé")
-            except:
-                pass
-        if app is not None:
-            try:
-                app.quit()
-                logger.debug("Application Excel fermée")
-            except:
-                pass
+        release_workbook(path)
+
+# Cache {(chemin classeur, nom feuille, nom tableau minuscule): ListObject},
+# rempli feuille par feuille à la première résolution, vidé quand un
+# classeur poolé ferme
+_LISTOBJECT_CACHE: Dict[Tuple[str, str, str], Any] = {}
+
+
+def find_list_object(sht, table_name: str):
+    """
+    Résout un tableau structuré par nom (insensible à la casse) avec cache.
+
+    Chaque accès à t.Name est un aller-retour COM : la feuille n'est énumérée
+    qu'une fois par session, les résolutions suivantes sont des accès dict.
+    La clé (classeur, feuille) est stable : id(sht.api) désignerait un
+    wrapper COM transitoire dont CPython peut réallouer l'adresse.
+
+    Args:
+        sht: Feuille xlwings
+        table_name: Nom du tableau structuré recherché
+
+    Returns:
+        ListObject COM, ou None si introuvable
+    """
+    book_key, sheet_key = sht.book.fullname, sht.name
+    key = (book_key, sheet_key, table_name.strip().lower())
+
+    if key not in _LISTOBJECT_CACHE:
+        for t in sht.api.ListObjects:
+            _LISTOBJECT_CACHE[(book_key, sheet_key, t.Name.strip().lower())] = t
+
+    return _LISTOBJECT_CACHE.get(key)
+
+
+def _get_table(wb, sheet_name: str, table_name: str):
+    """
+    Résout un tableau structuré depuis un classeur ouvert.
+
+    Args:
+        wb: Classeur xlwings
+        sheet_name: Nom de la feuille
+        table_name: Nom du tableau structuré
+
+    Returns:
+        ListObject COM, ou None si introuvable
+    """
+    return find_list_object(wb.sheets[sheet_name], table_name)
+
 
 def copy_template_excel(template_path: str, dest_path: str) -> None:
     """
@@ -63,36 +299,164 @@ def copy_template_excel(template_path: str, dest_path: str) -> None:
     if not os.path.exists(template_path):
         logger.error(f"Template Excel introuvable: {template_path}")
         raise FileNotFoundError(f"Template Excel introuvable : {template_path}")
-    
-    from shutil import copyfile
+
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    copyfile(template_path, dest_path)
+    _copy_file_fast(template_path, dest_path)
     logger.info(f"Template copié: {os.path.basename(dest_path)}")
 
 
+def _copy_file_fast(src: str, dst: str) -> None:
+    """
+    Copie un fichier avec le chemin le plus rapide disponible :
+    copy_file_range (copie noyau, clone CoW sur btrfs/XFS) quand il
+    existe, sinon copyfileobj avec un tampon de 16 Mo au lieu des
+    64 Ko par défaut. Sous Windows, shutil délègue déjà à CopyFile2.
+    """
+    import shutil
+
+    if hasattr(os, 'copy_file_range'):
+        try:
+            size = os.stat(src).st_size
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            shutil.copyfileobj(fsrc, fdst, length=16 * 1024 * 1024)
+    except Exception:
+        shutil.copyfile(src, dst)
+
+
+def _coalesce_cell_runs(values: Dict[str, Any]) -> Optional[List[Tuple[str, int, List[Any]]]]:
+    """
+    Regroupe des écritures {cellule A1: valeur} en runs de lignes consécutives
+    par colonne, pour les écrire en une affectation de plage chacune.
+
+    Args:
+        values: Dictionnaire {cellule: valeur} ex: {"C2": "Paris", "C3": "2025"}
+
+    Returns:
+        Liste de (colonne, ligne_debut, valeurs), ou None si une clé
+        n'est pas une référence A1 valide
+    """
+    from openpyxl.utils.cell import coordinate_from_string
+
+    by_column: Dict[str, List[Tuple[int, Any]]] = {}
+    try:
+        for cell, val in values.items():
+            col, row = coordinate_from_string(cell)
+            by_column.setdefault(col, []).append((row, val))
+    except Exception:
+        return None
+
+    runs = []
+    for col, cells in by_column.items():
+        cells.sort()
+        run_start, run_values = cells[0][0], [cells[0][1]]
+        for row, val in cells[1:]:
+            if row == run_start + len(run_values):
+                run_values.append(val)
+            else:
+                runs.append((col, run_start, run_values))
+                run_start, run_values = row, [val]
+        runs.append((col, run_start, run_values))
+
+    return runs
+
+
+def _pending_path(excel_path: str) -> Path:
+    """Chemin du fichier side-car des injections différées."""
+    return Path(excel_path).with_suffix('.pending.json')
+
+
+def flush_pending(excel_path: str) -> None:
+    """
+    Applique en une seule session Excel les injections accumulées via
+    inject_filter_values(..., defer=True), puis supprime le side-car.
+
+    Rien ne déclenche ce flush automatiquement : le code qui diffère des
+    injections doit l'appeler lui-même en fin de boucle, sans quoi les
+    valeurs accumulées n'atteignent jamais le classeur.
+
+    Args:
+        excel_path: Chemin du fichier Excel
+    """
+    pending_file = _pending_path(excel_path)
+    if not pending_file.exists():
+        return
+
+    try:
+        pending = json.loads(pending_file.read_text(encoding='utf-8'))
+    except Exception as e:
+        logger.warning(f"Side-car d'injections illisible ({e}), ignoré")
+        pending_file.unlink(missing_ok=True)
+        return
+
+    for sheet_name, values in pending.items():
+        inject_filter_values(excel_path, values, sheet_name=sheet_name)
+
+    pending_file.unlink(missing_ok=True)
+    logger.debug(f"Injections différées appliquées : {pending_file.name}")
+
+
 def inject_filter_values(
-    excel_path: str, 
-    values: Dict[str, Any], 
-    sheet_name: str = "Charts_settings"
+    excel_path: str,
+    values: Dict[str, Any],
+    sheet_name: str = "Charts_settings",
+    recalc: bool = True,
+    defer: bool = False
 ) -> None:
     """
     Injecte des valeurs dans des cellules spécifiques d'Excel.
-    
+
     Args:
         excel_path: Chemin du fichier Excel
         values: Dictionnaire {cellule: valeur} ex: {"C2": "Leclerc"}
         sheet_name: Nom de la feuille cible
-        
+        recalc: Si True, force un recalcul complet avant sauvegarde
+                (le recalcul automatique est coupé pendant les écritures)
+        defer: Si True, accumule les valeurs dans un side-car JSON sans
+               ouvrir Excel ; l'appelant doit ensuite invoquer
+               flush_pending() lui-même pour les appliquer en une passe
+
     Example:
         inject_filter_values("data.xlsx", {"C2": "Paris", "C3": "2025"})
     """
     if not values:
         logger.debug("Aucune valeur à injecter")
         return
+
+    if defer:
+        # Accumulation dans le side-car : l'ouverture/sauvegarde Excel
+        # est payée une seule fois au flush_pending de fin de pipeline
+        pending_file = _pending_path(excel_path)
+        pending = {}
+        if pending_file.exists():
+            try:
+                pending = json.loads(pending_file.read_text(encoding='utf-8'))
+            except Exception:
+                pending = {}
+        pending.setdefault(sheet_name, {}).update(values)
+        # Écriture atomique : un crash en pleine écriture laisserait sinon
+        # un side-car tronqué et perdrait toutes les injections accumulées
+        tmp_file = pending_file.with_suffix('.pending.json.tmp')
+        tmp_file.write_text(json.dumps(pending, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_file, pending_file)
+        logger.debug(f"Injection différée : {len(values)} cellules en attente")
+        return
     
     logger.debug(f"Injection dans {sheet_name}: {values}")
     
-    with excel_app_context(excel_path) as (app, wb):
+    with _EXCEL_LOCK, excel_app_context(excel_path) as (app, wb):
         try:
             sheet = wb.sheets[sheet_name]
             logger.debug(f"Feuille '{sheet_name}' trouvée")
@@ -101,18 +465,297 @@ def inject_filter_values(
             logger.error(f"Feuille '{sheet_name}' introuvable. Disponibles: {available_sheets}")
             raise ValueError(f"Feuille '{sheet_name}' introuvable dans {excel_path}")
         
-        for cell, val in values.items():
+        # Écritures regroupées par colonnes de cellules consécutives :
+        # une affectation de plage par run au lieu d'un appel COM par cellule
+        runs = _coalesce_cell_runs(values)
+
+        if runs is None:
+            # Clés non parsables : retour au chemin cellule par cellule
+            for cell, val in values.items():
+                try:
+                    sheet.range(cell).value = val
+                    logger.debug(f"  {cell} = {val}")
+                except Exception as e:
+                    logger.error(f"Erreur injection {cell}: {e}")
+                    raise ValueError(f"Erreur lors de l'injection en cellule {cell} : {e}")
+        else:
+            for col, row_start, run_values in runs:
+                addr = f"{col}{row_start}:{col}{row_start + len(run_values) - 1}"
+                try:
+                    sheet.range(addr).value = [[v] for v in run_values]
+                    logger.debug(f"  {addr} = {run_values}")
+                except Exception as e:
+                    logger.error(f"Erreur injection {addr}: {e}")
+                    raise ValueError(f"Erreur lors de l'injection en plage {addr} : {e}")
+
+        if recalc:
             try:
-                sheet.range(cell).value = val
-                logger.debug(f"  {cell} = {val}")
+                wb.api.Application.CalculateFull()
             except Exception as e:
-                logger.error(f"Erreur injection {cell}: {e}")
-                raise ValueError(f"Erreur lors de l'injection en cellule {cell} : {e}")
-        
+                logger.debug(f"Recalcul complet impossible : {e}")
+
         wb.save()
         logger.info(f"Valeurs injectées: {len(values)} cellules")
 
 
+def _normalize_value2(raw) -> List[tuple]:
+    """
+    Normalise le retour de Range.Value2 en liste de lignes.
+    COM renvoie un scalaire pour une cellule unique et un tuple plat
+    pour une ligne unique.
+    """
+    if raw is None:
+        return []
+    if not isinstance(raw, (list, tuple)):
+        return [(raw,)]
+    if raw and not isinstance(raw[0], (list, tuple)):
+        return [tuple(raw)]
+    return [tuple(row) for row in raw]
+
+
+# Espaces de noms OOXML
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_DOCREL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+def _resolve_sheet_path(zf, sheet_name: str) -> Optional[str]:
+    """
+    Résout le chemin interne (xl/worksheets/sheetN.xml) d'une feuille
+    dans un .xlsx ouvert via zipfile.
+
+    Args:
+        zf: ZipFile ouvert sur le .xlsx
+        sheet_name: Nom de la feuille
+
+    Returns:
+        Chemin interne de la feuille, ou None si introuvable
+    """
+    import xml.etree.ElementTree as ET
+
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    rel_targets = {r.get('Id'): r.get('Target') for r in rels}
+
+    for sheet in workbook.iter(f'{_NS_MAIN}sheet'):
+        if sheet.get('name') != sheet_name:
+            continue
+        target = (rel_targets.get(sheet.get(f'{_NS_DOCREL}id')) or '').lstrip('/')
+        if target and not target.startswith('xl/'):
+            target = f"xl/{target}"
+        return target or None
+
+    return None
+
+
+def _sheet_hyperlinks(excel_path: str, sheet_name: str) -> Dict[Tuple[int, int], str]:
+    """
+    Lit tous les hyperliens natifs d'une feuille en parsant son XML :
+    l'OOXML les regroupe dans un unique bloc <hyperlinks>.
+
+    Args:
+        excel_path: Chemin du fichier Excel
+        sheet_name: Nom de la feuille
+
+    Returns:
+        Dict {(ligne, colonne) 1-based: url}
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+    from openpyxl.utils.cell import coordinate_to_tuple
+
+    hyperlinks: Dict[Tuple[int, int], str] = {}
+
+    with zipfile.ZipFile(excel_path) as zf:
+        names = set(zf.namelist())
+
+        sheet_path = _resolve_sheet_path(zf, sheet_name)
+        if not sheet_path:
+            return hyperlinks
+
+        # URLs externes résolues via les relations de la feuille
+        prefix, _, filename = sheet_path.rpartition('/')
+        rels_path = f"{prefix}/_rels/{filename}.rels"
+        rel_targets = {}
+        if rels_path in names:
+            rel_targets = {
+                r.get('Id'): r.get('Target')
+                for r in ET.fromstring(zf.read(rels_path))
+            }
+
+        sheet_xml = ET.fromstring(zf.read(sheet_path))
+        for hl in sheet_xml.iter(f'{_NS_MAIN}hyperlink'):
+            ref = hl.get('ref')
+            if not ref:
+                continue
+            url = rel_targets.get(hl.get(f'{_NS_DOCREL}id')) or hl.get('location')
+            if not url:
+                continue
+            row, col = coordinate_to_tuple(ref.split(':')[0])
+            hyperlinks[(row, col)] = url
+
+    return hyperlinks
+
+
+def _resolve_table_ref(excel_path: str, sheet_name: str, table_name: str) -> Optional[str]:
+    """
+    Résout la plage A1 d'un tableau structuré en parsant le XML du .xlsx.
+
+    Args:
+        excel_path: Chemin du fichier Excel
+        sheet_name: Feuille attendue pour le tableau
+        table_name: Nom du tableau structuré
+
+    Returns:
+        Plage A1 (ex: "A1:C25") ou None si non trouvée
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+
+    target_name = table_name.strip().lower()
+
+    with zipfile.ZipFile(excel_path) as zf:
+        names = set(zf.namelist())
+
+        sheet_path = _resolve_sheet_path(zf, sheet_name)
+        if not sheet_path:
+            return None
+
+        prefix, _, filename = sheet_path.rpartition('/')
+        rels_path = f"{prefix}/_rels/{filename}.rels"
+        if rels_path not in names:
+            return None
+
+        for rel in ET.fromstring(zf.read(rels_path)):
+            target = rel.get('Target', '')
+            if 'tables/' not in target:
+                continue
+
+            table_path = f"xl/tables/{target.rsplit('/', 1)[-1]}"
+            if table_path not in names:
+                continue
+
+            table = ET.fromstring(zf.read(table_path))
+            name = table.get('displayName') or table.get('name') or ''
+            if name.strip().lower() == target_name:
+                return table.get('ref')
+
+    return None
+
+
+def _read_table_via_zip(
+    excel_path: str,
+    sheet_name: str,
+    table_name: str
+) -> Optional[List[tuple]]:
+    """
+    Lit le corps d'un tableau structuré en ouvrant le .xlsx directement
+    (openpyxl read_only), sans démarrer Excel ni payer d'allers-retours COM.
+
+    Returns:
+        Lignes du corps du tableau (en-tête exclue), ou None pour
+        retomber sur la lecture via Excel
+    """
+    ref = _resolve_table_ref(excel_path, sheet_name, table_name)
+    if not ref:
+        return None
+
+    import openpyxl
+    from openpyxl.utils import range_boundaries
+
+    min_col, min_row, max_col, max_row = range_boundaries(ref)
+    if max_col - min_col < 2:
+        return None
+
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name]
+        # min_row + 1 : la première ligne de la plage est l'en-tête du tableau
+        return list(ws.iter_rows(
+            min_row=min_row + 1, max_row=max_row,
+            min_col=min_col, max_col=max_col,
+            values_only=True
+        ))
+    finally:
+        wb.close()
+
+
+# Formats de nombre servables sans Excel : le texte affiché coïncide
+# avec la valeur brute (General) ou le texte saisi (@)
+_PLAIN_NUMBER_FORMATS = frozenset({"General", "@"})
+
+
+def _load_tags_openpyxl(
+    excel_path: str,
+    sheet_name: str,
+    table_name: str
+) -> Optional[Dict[str, str]]:
+    """
+    Lit les balises via le XML du .xlsx, sans démarrer Excel.
+
+    Seules les cellules de valeur au format General ou Texte sont
+    éligibles : pour tout autre format (date, pourcentage...), le texte
+    affiché dépend du format de nombre appliqué par Excel, et la valeur
+    brute du cache openpyxl ne le reflète pas. On retombe alors sur la
+    lecture via Excel pour récupérer le texte formaté fidèlement.
+
+    Returns:
+        Dict des balises, ou None pour retomber sur la lecture via Excel
+    """
+    ref = _resolve_table_ref(excel_path, sheet_name, table_name)
+    if not ref:
+        return None
+
+    import openpyxl
+    from openpyxl.utils import range_boundaries
+
+    min_col, min_row, max_col, max_row = range_boundaries(ref)
+    if max_col - min_col < 2:
+        return None
+
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name]
+        tags: Dict[str, str] = {}
+        # min_row + 1 : la première ligne de la plage est l'en-tête du tableau
+        for row in ws.iter_rows(
+            min_row=min_row + 1, max_row=max_row,
+            min_col=min_col, max_col=max_col
+        ):
+            key, cell = row[0].value, row[2]
+            if not key or cell.value is None:
+                continue
+            if cell.number_format not in _PLAIN_NUMBER_FORMATS:
+                return None
+            tags[key] = _format_general(cell.value)
+        return tags
+    finally:
+        wb.close()
+
+
+@functools.lru_cache(maxsize=32)
+def _load_tags_cached(
+    excel_path: str,
+    mtime: float,
+    sheet_name: str,
+    table_name: str
+) -> Optional[Dict[str, str]]:
+    """
+    Variante mémoïsée de la lecture directe des balises, invalidée par
+    le mtime du fichier (modifié par tout wb.save()).
+    """
+    return _load_tags_openpyxl(excel_path, sheet_name, table_name)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_loop_rows_cached(
+    excel_path: str,
+    mtime: float,
+    sheet_name: str
+) -> Optional[List[tuple]]:
+    """Variante mémoïsée de la lecture directe du tableau Loop."""
+    return _read_table_via_zip(excel_path, sheet_name, "Loop")
+
+
 def load_replacement_tags(
     excel_path: str, 
     sheet_name: str = "Balises", 
@@ -133,87 +776,161 @@ def load_replacement_tags(
         tags = load_replacement_tags("data.xlsx")
         # {"[Marque]": "BOMBAY", "[Segment]": "Gin"}
     """
-    max_retries = 3
-    
-    for attempt in range(max_retries):
-        try:
-            if attempt > 0:
-                _force_close_excel_instances()
-                import time
-                time.sleep(2.0)
-            
-            with excel_app_context(excel_path) as (app, wb):
-                try:
-                    sht = wb.sheets[sheet_name]
-                except Exception:
-                    raise ValueError(f"Feuille '{sheet_name}' introuvable")
-                
-                if not hasattr(sht, 'api') or sht.api is None:
-                    raise RuntimeError("API Excel corrompue")
-                
-                # Recherche du tableau
-                table = None
-                try:
-                    list_objects = sht.api.ListObjects
-                    if list_objects is None:
-                        raise ValueError(f"Aucun tableau accessible dans '{sheet_name}'")
-                    
+    # Fast path : lecture directe du XML du .xlsx (mémoïsée par mtime)
+    try:
+        tags = None
+        if _FAST_READ:
+            mtime = os.path.getmtime(excel_path)
+            tags = _load_tags_cached(excel_path, mtime, sheet_name, table_name)
+        if tags is not None:
+            logger.info(f"{len(tags)} balises chargées (sans Excel)")
+            # Copie : le dict mis en cache ne doit pas être mutable par l'appelant
+            return dict(tags)
+    except Exception as e:
+        logger.debug(f"Lecture directe des balises impossible ({e}), lecture via Excel")
+
+    with _EXCEL_LOCK:
+        for attempt in range(2):
+            try:
+                with excel_app_context(excel_path) as (app, wb):
                     try:
-                        table = list_objects(table_name)
-                        if table:
-                            logger.debug(f"Tableau '{table_name}' trouvé par accès direct")
-                    except:
-                        for t in list_objects:
-                            if t.Name.strip().lower() == table_name.lower():
-                                table = t
-                                logger.debug(f"Tableau '{table_name}' trouvé par itération")
-                                break
-                
-                except Exception as list_error:
-                    raise RuntimeError(f"Erreur accès tableaux : {list_error}")
-                
-                if not table:
-                    raise ValueError(f"Tableau '{table_name}' introuvable dans '{sheet_name}'")
-                
-                # Lecture des balises
-                replacements = {}
-                try:
+                        sht = wb.sheets[sheet_name]
+                    except Exception:
+                        raise ValueError(f"Feuille '{sheet_name}' introuvable")
+
+                    # Recherche du tableau (énumération unique, mise en cache)
+                    table = find_list_object(sht, table_name)
+                    if not table:
+                        raise ValueError(f"Tableau '{table_name}' introuvable dans '{sheet_name}'")
+
+                    # Lecture des balises : un seul appel COM pour tout le corps
+                    # du tableau au lieu d'un aller-retour par cellule
                     data_range = table.DataBodyRange
                     if data_range is None:
                         logger.warning(f"Tableau '{table_name}' vide")
                         return {}
-                    
-                    for row in data_range.Rows:
-                        try:
-                            balise = row.Columns(1).Value
-                            valeur = row.Columns(3).Text
-                            if balise and valeur is not None:
-                                replacements[balise] = str(valeur)
-                        except Exception:
-                            continue
-                
-                except Exception as e:
-                    raise RuntimeError(f"Erreur lecture balises : {e}")
-                
-                logger.info(f"{len(replacements)} balises chargées")
-                return replacements
-        
-        except Exception as e:
-            error_msg = str(e).lower()
-            is_com_error = any(keyword in error_msg for keyword in [
-                "enumeration", "rejeté", "rejected", "automation", "com_error"
-            ])
-            
-            if is_com_error and attempt < max_retries - 1:
-                logger.warning(f"Tentative {attempt + 1} échouée (erreur COM), retry...")
-                continue
-            else:
-                logger.error(f"Erreur lecture balises après {attempt + 1} tentatives")
+
+                    # Texte affiché (.Text) et non Value2 brut : une année
+                    # doit rester "2025" et non "2025.0", un pourcentage ou
+                    # une date doivent garder leur format de nombre
+                    rows = read_range_display_text(sht, data_range)
+                    replacements = {
+                        row[0]: row[2]
+                        for row in rows
+                        if row[0] and row[2]
+                    }
+
+                    logger.info(f"{len(replacements)} balises chargées")
+                    return replacements
+
+            except Exception as e:
+                if attempt == 0 and _is_com_error(e):
+                    logger.warning("Erreur COM, réouverture du classeur et nouvel essai...")
+                    flush_and_close(excel_path)
+                    continue
+                logger.error(f"Erreur lecture balises : {e}")
                 raise
-    
+
     return {}
 
 
+def _format_general(value) -> str:
+    """Formate une valeur Value2 comme le format Excel 'General'."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# Espace de noms XML Spreadsheet 2003 (Range.Value(xlRangeValueXMLSpreadsheet))
+_NS_SS = '{urn:schemas-microsoft-com:office:spreadsheet}'
+
+
+def _parse_xml_spreadsheet(
+    xml_blob: str,
+    num_rows: int,
+    num_cols: int
+) -> Optional[Tuple[List[List[str]], Dict[Tuple[int, int], Dict[str, str]]]]:
+    """
+    Parse le blob XML Spreadsheet 2003 d'une plage : texte affiché,
+    formules HYPERLINK et liens natifs (ss:HRef) en un seul passage.
+
+    Returns:
+        (data_text, hyperlinks_data), ou None si le blob est inexploitable
+    """
+    import xml.etree.ElementTree as ET
+
+    if not xml_blob:
+        return None
+
+    root = ET.fromstring(xml_blob)
+    table = root.find(f'.//{_NS_SS}Table')
+    if table is None:
+        return None
+
+    data_text = [["" for _ in range(num_cols)] for _ in range(num_rows)]
+    hyperlinks_data: Dict[Tuple[int, int], Dict[str, str]] = {}
+
+    r = -1
+    for row_el in table.findall(f'{_NS_SS}Row'):
+        index = row_el.get(f'{_NS_SS}Index')
+        r = int(index) - 1 if index else r + 1
+
+        c = -1
+        for cell_el in row_el.findall(f'{_NS_SS}Cell'):
+            index = cell_el.get(f'{_NS_SS}Index')
+            c = int(index) - 1 if index else c + 1
+            if not (0 <= r < num_rows and 0 <= c < num_cols):
+                continue
+
+            data_el = cell_el.find(f'{_NS_SS}Data')
+            text = (data_el.text or "") if data_el is not None else ""
+            data_text[r][c] = text
+
+            url = cell_el.get(f'{_NS_SS}HRef')
+            if not url:
+                formula = cell_el.get(f'{_NS_SS}Formula') or ""
+                if "HYPERLINK(" in formula.upper():
+                    url = _extract_url_from_hyperlink_formula(formula)
+            if url:
+                hyperlinks_data[(r, c)] = {"text": text, "url": url}
+
+    return data_text, hyperlinks_data
+
+
+def read_range_display_text(sht, data_range) -> List[List[str]]:
+    """
+    Lit le texte affiché (format de nombre Excel appliqué) d'une plage COM.
+
+    Value(11) renvoie la plage entière en XML Spreadsheet 2003 : un seul
+    appel COM pour tout le corps, texte formaté inclus. Repli sur .Text
+    cellule par cellule si le blob est inexploitable.
+
+    Args:
+        sht: Feuille xlwings
+        data_range: Plage COM (ex: DataBodyRange d'un ListObject)
+
+    Returns:
+        Matrice du texte affiché (lignes x colonnes)
+    """
+    num_rows = data_range.Rows.Count
+    num_cols = data_range.Columns.Count
+    range_api = sht.api.Range(data_range.Address)
+
+    try:
+        parsed = _parse_xml_spreadsheet(range_api.Value(11), num_rows, num_cols)
+        if parsed is not None:
+            return parsed[0]
+    except Exception as e:
+        logger.debug(f"Lecture XML Spreadsheet impossible ({e}), lecture .Text par cellule")
+
+    return [
+        [str(range_api.Cells(r + 1, c + 1).Text) for c in range(num_cols)]
+        for r in range(num_rows)
+    ]
+
+
 def read_excel_range_data(
     excel_path: str, 
     sheet_name: str, 
@@ -232,7 +949,7 @@ def read_excel_range_data(
         - data_text: Liste de listes avec le texte formaté
         - hyperlinks_data: Dict {(row, col): {"text": str, "url": str}}
     """
-    with excel_app_context(excel_path) as (app, wb):
+    with _EXCEL_LOCK, excel_app_context(excel_path) as (app, wb):
         try:
             sht = wb.sheets[sheet_name]
         except Exception:
@@ -240,66 +957,90 @@ def read_excel_range_data(
         
         try:
             range_obj = sht.range(excel_range)
-            data = range_obj.api.Value2
-            
-            if not data:
+
+            # Un seul appel COM : Value(11) renvoie la plage entière en
+            # XML Spreadsheet 2003 (texte, formules et liens inclus)
+            try:
+                from openpyxl.utils import range_boundaries
+                min_col, min_row, max_col, max_row = range_boundaries(
+                    excel_range.replace('$', '')
+                )
+                parsed = _parse_xml_spreadsheet(
+                    range_obj.api.Value(11),
+                    max_row - min_row + 1,
+                    max_col - min_col + 1
+                )
+                if parsed is not None:
+                    data_text, hyperlinks_data = parsed
+                    logger.debug(
+                        f"Lecture {excel_range}: {len(data_text)}x{len(data_text[0])}, "
+                        f"{len(hyperlinks_data)} hyperliens (XML)"
+                    )
+                    return data_text, hyperlinks_data
+            except Exception as e:
+                logger.debug(f"Lecture XML Spreadsheet impossible ({e}), lecture vectorisée")
+
+            data = _normalize_value2(range_obj.api.Value2)
+
+            if not data or not data[0]:
                 return [], {}
-            
-            hyperlinks_data = {}
-            
-            # Gestion dimensions
-            if isinstance(data, (list, tuple)) and len(data) > 0:
-                if isinstance(data[0], (list, tuple)):
-                    num_rows = len(data)
-                    num_cols = len(data[0]) if data[0] else 0
-                else:
-                    num_rows = 1
-                    num_cols = len(data)
-                    data = [data]
+
+            num_rows = len(data)
+            num_cols = len(data[0])
+
+            # Texte : conversion Python sur la matrice Value2 si le format
+            # de nombre est uniforme "General", sinon .Text cellule par cellule
+            number_format = None
+            try:
+                number_format = range_obj.api.NumberFormat
+            except Exception:
+                pass
+
+            if number_format == "General":
+                data_text = [[_format_general(v) for v in row] for row in data]
             else:
-                num_rows = 1
-                num_cols = 1
-                data = [[data]]
-            
-            # Lecture hyperliens et texte formaté
-            data_text = []
-            for r in range(num_rows):
-                row_data = []
-                for c in range(num_cols):
-                    cell = range_obj.api.Cells(r + 1, c + 1)
-                    formatted_text = str(cell.Text)
-                    row_data.append(formatted_text)
-                    
-                    # Vérification formules HYPERLINK
-                    try:
-                        formula = str(cell.Formula)
-                        if formula and "HYPERLINK(" in formula.upper():
+                data_text = [
+                    [str(range_obj.api.Cells(r + 1, c + 1).Text) for c in range(num_cols)]
+                    for r in range(num_rows)
+                ]
+
+            hyperlinks_data = {}
+
+            # Formules HYPERLINK : matrice de formules lue en un seul appel COM
+            try:
+                formulas = _normalize_value2(range_obj.api.Formula)
+                for r, row in enumerate(formulas):
+                    for c, formula in enumerate(row):
+                        formula = str(formula or '')
+                        if "HYPERLINK(" in formula.upper():
                             url = _extract_url_from_hyperlink_formula(formula)
                             if url:
                                 hyperlinks_data[(r, c)] = {
-                                    "text": formatted_text,
+                                    "text": data_text[r][c],
                                     "url": url
                                 }
-                                continue
-                    except:
-                        pass
-                    
-                    # Hyperliens natifs Excel
-                    try:
-                        if cell.Hyperlinks.Count > 0:
-                            hyperlink = cell.Hyperlinks.Item(1)
-                            hyperlinks_data[(r, c)] = {
-                                "text": formatted_text,
-                                "url": hyperlink.Address
-                            }
-                    except:
-                        pass
-                
-                data_text.append(row_data)
-            
+            except Exception:
+                pass
+
+            # Hyperliens natifs : le bloc <hyperlinks> du XML de la feuille
+            # est parsé en un passage, aucun appel COM
+            try:
+                base_row = range_obj.api.Row
+                base_col = range_obj.api.Column
+                for (row, col), url in _sheet_hyperlinks(excel_path, sheet_name).items():
+                    r = row - base_row
+                    c = col - base_col
+                    if 0 <= r < num_rows and 0 <= c < num_cols and (r, c) not in hyperlinks_data:
+                        hyperlinks_data[(r, c)] = {
+                            "text": data_text[r][c],
+                            "url": url
+                        }
+            except Exception:
+                pass
+
             logger.debug(f"Lecture {excel_range}: {num_rows}x{num_cols}, {len(hyperlinks_data)} hyperliens")
             return data_text, hyperlinks_data
-        
+
         except Exception as e:
             raise RuntimeError(f"Erreur lecture plage {excel_range} : {e}")
 
@@ -316,79 +1057,68 @@ def read_loop_table_count(excel_path: str, sheet_name: str, loop_id: str) -> Opt
     Returns:
         Nombre de tests ou None si non trouvé
     """
-    max_retries = 3
-    
-    for attempt in range(max_retries):
-        try:
-            if attempt > 0:
-                _force_close_excel_instances()
-                import time
-                time.sleep(2.0)
-            
-            with excel_app_context(excel_path) as (app, wb):
-                try:
-                    sht = wb.sheets[sheet_name]
-                except Exception:
-                    raise ValueError(f"Feuille '{sheet_name}' introuvable")
-                
-                if not hasattr(sht, 'api') or sht.api is None:
-                    raise RuntimeError("API Excel corrompue")
-                
-                try:
-                    table = None
-                    list_objects = sht.api.ListObjects
-                    
-                    if list_objects is None:
-                        raise ValueError(f"Aucun tableau accessible dans '{sheet_name}'")
-                    
+    # Fast path : lecture directe du XML du .xlsx (mémoïsée par mtime)
+    try:
+        rows = None
+        if _FAST_READ:
+            mtime = os.path.getmtime(excel_path)
+            rows = _read_loop_rows_cached(excel_path, mtime, sheet_name)
+        if rows is not None:
+            for row in rows:
+                id_value, count_value = row[0], row[2]
+                if id_value and str(id_value).strip() == loop_id:
+                    result = int(count_value) if count_value is not None else None
+                    logger.debug(f"Loop '{loop_id}' trouvé: {result} tests (sans Excel)")
+                    return result
+            logger.warning(f"Loop ID '{loop_id}' non trouvé dans le tableau")
+            return None
+    except Exception as e:
+        logger.debug(f"Lecture directe du tableau Loop impossible ({e}), lecture via Excel")
+
+    with _EXCEL_LOCK:
+        for attempt in range(2):
+            try:
+                with excel_app_context(excel_path) as (app, wb):
                     try:
-                        table = list_objects("Loop")
-                    except:
-                        for t in list_objects:
-                            if t.Name.strip().lower() == "loop":
-                                table = t
-                                break
-                    
+                        sht = wb.sheets[sheet_name]
+                    except Exception:
+                        raise ValueError(f"Feuille '{sheet_name}' introuvable")
+
+                    table = find_list_object(sht, "Loop")
                     if not table:
-                        available_tables = [t.Name for t in list_objects]
+                        available_tables = [t.Name for t in sht.api.ListObjects]
                         raise ValueError(f"Tableau 'Loop' introuvable. Disponibles: {available_tables}")
-                    
+
                     data_range = table.DataBodyRange
                     if data_range is None:
                         logger.warning("Tableau Loop vide")
                         return None
-                    
-                    for row in data_range.Rows:
-                        try:
-                            id_value = row.Columns(1).Value
-                            count_value = row.Columns(3).Value
-                            
-                            if id_value and str(id_value).strip() == loop_id:
-                                result = int(count_value) if count_value is not None else None
-                                logger.debug(f"Loop '{loop_id}' trouvé: {result} tests")
-                                return result
-                        except Exception:
-                            continue
-                    
-                    logger.warning(f"Loop ID '{loop_id}' non trouvé dans le tableau")
-                    return None
-                
-                except Exception as e:
-                    raise RuntimeError(f"Erreur lecture tableau Loop : {e}")
-        
-        except Exception as e:
-            error_msg = str(e).lower()
-            is_com_error = any(keyword in error_msg for keyword in [
-                "enumeration", "rejeté", "rejected", "automation", "com_error"
-            ])
-            
-            if is_com_error and attempt < max_retries - 1:
-                logger.warning(f"Lecture Loop tentative {attempt + 1} échouée, retry...")
-                continue
-            else:
-                logger.error(f"Erreur lecture Loop après {attempt + 1} tentatives")
+
+                    # Corps du tableau lu en un seul appel COM, puis colonnes
+                    # scannées à plat (pas d'objet ligne intermédiaire)
+                    values = _normalize_value2(sht.api.Range(data_range.Address).Value2)
+                    ids = [row[0] for row in values]
+                    i = next(
+                        (k for k, v in enumerate(ids) if v and str(v).strip() == loop_id),
+                        -1
+                    )
+                    if i < 0:
+                        logger.warning(f"Loop ID '{loop_id}' non trouvé dans le tableau")
+                        return None
+
+                    count_value = values[i][2]
+                    result = int(count_value) if count_value is not None else None
+                    logger.debug(f"Loop '{loop_id}' trouvé: {result} tests")
+                    return result
+
+            except Exception as e:
+                if attempt == 0 and _is_com_error(e):
+                    logger.warning("Erreur COM, réouverture du classeur et nouvel essai...")
+                    flush_and_close(excel_path)
+                    continue
+                logger.error(f"Erreur lecture Loop : {e}")
                 return None
-    
+
     return None
 
 
@@ -407,116 +1137,97 @@ def update_loop_table_iteration(
         loop_id: ID de la boucle
         iteration_value: Nouvelle valeur d'itération
     """
-    max_retries = 2
-    
-    for attempt in range(max_retries):
-        try:
-            with excel_app_context(excel_path) as (app, wb):
-                try:
-                    sht = wb.sheets[sheet_name]
-                except Exception:
-                    raise ValueError(f"Feuille '{sheet_name}' introuvable")
-                
-                if not hasattr(sht, 'api') or sht.api is None:
-                    raise RuntimeError("Session Excel corrompue")
-                
-                try:
-                    table = None
-                    list_objects = sht.api.ListObjects
-                    
-                    if list_objects is None:
-                        raise RuntimeError("ListObjects inaccessible")
-                    
-                    for t in list_objects:
-                        if t.Name.strip().lower() == "loop":
-                            table = t
-                            break
-                    
+    with _EXCEL_LOCK:
+        for attempt in range(2):
+            try:
+                with excel_app_context(excel_path) as (app, wb):
+                    try:
+                        sht = wb.sheets[sheet_name]
+                    except Exception:
+                        raise ValueError(f"Feuille '{sheet_name}' introuvable")
+
+                    table = find_list_object(sht, "Loop")
                     if not table:
                         raise ValueError(f"Tableau 'Loop' introuvable dans '{sheet_name}'")
-                    
-                    updated = False
-                    for row in table.DataBodyRange.Rows:
-                        id_value = row.Columns(1).Value
-                        if id_value and str(id_value).strip() == loop_id:
-                            row.Columns(2).Value = iteration_value
-                            updated = True
-                            break
-                    
-                    if not updated:
+
+                    # Lecture en bloc puis colonnes scannées à plat ;
+                    # écriture d'une seule cellule
+                    data_range = table.DataBodyRange
+                    values = _normalize_value2(sht.api.Range(data_range.Address).Value2)
+                    ids = [row[0] for row in values]
+                    i = next(
+                        (k for k, v in enumerate(ids) if v and str(v).strip() == loop_id),
+                        -1
+                    )
+                    if i < 0:
                         raise ValueError(f"Loop ID '{loop_id}' non trouvé")
-                    
+
+                    # Valeur inchangée : on évite l'écriture et surtout
+                    # la sauvegarde (plusieurs secondes sur un gros xlsx)
+                    current = values[i][1]
+                    try:
+                        if current is not None and int(current) == int(iteration_value):
+                            logger.debug(
+                                f"Loop '{loop_id}' déjà à {iteration_value}, sauvegarde évitée"
+                            )
+                            return
+                    except (TypeError, ValueError):
+                        pass
+
+                    data_range.Cells(i + 1, 2).Value = iteration_value
+
+                    # Recalcul unique avant sauvegarde (calcul automatique coupé)
+                    try:
+                        wb.api.Application.CalculateFull()
+                    except Exception as e:
+                        logger.debug(f"Recalcul complet impossible : {e}")
+
                     wb.save()
                     logger.debug(f"Loop '{loop_id}' mis à jour: itération={iteration_value}")
                     return
-                
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Tentative {attempt + 1} échouée: {e}")
-                        import time
-                        time.sleep(1.0)
-                        continue
-                    else:
-                        raise RuntimeError(f"Erreur mise à jour Loop : {e}")
-        
-        except Exception as e:
-            if attempt < max_retries - 1:
-                import time
-                time.sleep(1.0)
-                continue
-            else:
-                raise
+
+            except Exception as e:
+                if attempt == 0 and _is_com_error(e):
+                    logger.warning("Erreur COM, réouverture du classeur et nouvel essai...")
+                    flush_and_close(excel_path)
+                    continue
+                raise RuntimeError(f"Erreur mise à jour Loop : {e}")
 
 
 def _extract_url_from_hyperlink_formula(formula: str) -> Optional[str]:
     """Extrait l'URL d'une formule HYPERLINK Excel."""
-    import re
-    
     try:
-        pattern = r'HYPERLINK\s*\(\s*"([^"]+)"[,;]'
-        match = re.search(pattern, formula, re.IGNORECASE)
-        
+        match = _HYPERLINK_RE.search(formula)
         if match:
-            return match.group(1).strip()
-        
-        pattern2 = r'HYPERLINK\s*\(\s*([^,;)]+)[,;)]'
-        match2 = re.search(pattern2, formula, re.IGNORECASE)
-        
-        if match2:
-            url = match2.group(1).strip().strip('"\'')
-            return url
-    
+            quoted, bare = match.groups()
+            if quoted is not None:
+                return quoted.strip()
+            return bare.strip().strip('"\'')
+
     except Exception:
         pass
-    
+
     return None
 
 
 def _force_close_excel_instances() -> None:
-    """Force la fermeture de toutes les instances Excel ouvertes."""
-    try:
-        import psutil
-        import os
-        
-        excel_processes = []
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if proc.info['name'].lower() in ['excel.exe', 'xlwings32.exe']:
-                    excel_processes.append(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        
-        if excel_processes:
-            logger.debug(f"Fermeture forcée de {len(excel_processes)} processus Excel")
-            for pid in excel_processes:
-                try:
-                    os.kill(pid, 9)
-                except:
-                    continue
-    except ImportError:
+    """
+    Force la fermeture de toutes les instances Excel ouvertes.
+    taskkill filtre côté noyau : pas de parcours psutil de tous les
+    processus du système dans la boucle de retry COM.
+    """
+    import subprocess
+
+    creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+    for image in ('excel.exe', 'xlwings32.exe'):
         try:
-            import os
-            os.system("taskkill /f /im excel.exe 2>nul")
-            os.system("taskkill /f /im xlwings32.exe 2>nul")
-        except:
-            pass
\ No newline at end of file
+            subprocess.run(
+                ['taskkill', '/F', '/IM', image, '/T'],
+                capture_output=True,
+                creationflags=creationflags
+            )
+        except Exception:
+            continue
+
+    logger.debug("Fermeture forcée des processus Excel demandée")
\ No newline at end of file
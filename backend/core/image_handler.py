@@ -3,13 +3,84 @@ Image Handler - Gestion de l'injection d'images dans PowerPoint
 Adapté de spirits_study pour KAIVAA Builder
 """
 
+import functools
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from loguru import logger
 
 
+# Constantes Office (MsoZOrderCmd, MsoShapeType) : résolues depuis le
+# typelib généré (early binding) si disponible, sinon valeurs documentées
+try:
+    from win32com.client import constants as _mso
+    MSO_BRINGTOFRONT = int(getattr(_mso, "msoBringToFront", 0))
+    MSO_SENDTOBACK = int(getattr(_mso, "msoSendToBack", 1))
+    MSO_BRINGFORWARD = int(getattr(_mso, "msoBringForward", 2))
+    MSO_SENDBACKWARD = int(getattr(_mso, "msoSendBackward", 3))
+    MSO_GROUP = int(getattr(_mso, "msoGroup", 6))
+except Exception:
+    MSO_BRINGTOFRONT = 0
+    MSO_SENDTOBACK = 1
+    MSO_BRINGFORWARD = 2
+    MSO_SENDBACKWARD = 3
+    MSO_GROUP = 6
+
+# Motif {variable} des patterns d'images, compilé une fois pour tout le module
+_VAR_RE = re.compile(r'\{([^}]+)\}')
+
+# Caractères remplacés par '_' dans les noms de fichiers : un seul passage
+# C via str.translate au lieu d'un str.replace par caractère
+_FILENAME_TRANS = str.maketrans({
+    ' ': '_', '/': '_', '\\': '_', ':': '_', '*': '_',
+    '?': '_', '"': '_', '<': '_', '>': '_', '|': '_',
+    '-': '_', '.': '_'
+})
+
+# Effondre les suites de '_' en un seul scan linéaire
+_UNDERSCORE_RUN_RE = re.compile(r'_+')
+
+# Les mêmes chemins (assets par défaut, dossiers de marques) sont testés des
+# dizaines de fois par génération : un cache LRU évite de repayer les stat()
+@functools.lru_cache(maxsize=4096)
+def _cached_exists(path: str) -> bool:
+    """os.path.exists mémoïsé (invalidé via clear_image_path_cache)"""
+    return os.path.exists(path)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_abspath(path: str) -> str:
+    """os.path.abspath mémoïsé"""
+    return os.path.abspath(path)
+
+
+@functools.lru_cache(maxsize=512)
+def _scan_dir(directory: str) -> frozenset:
+    """
+    Noms de fichiers d'un dossier (minuscules), en un seul scandir.
+    Tester N produits d'une même marque coûte ainsi un syscall au lieu
+    de N stat() — particulièrement sensible sur FS réseau Windows.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name.lower() for entry in entries)
+    except OSError:
+        return frozenset()
+
+
+def clear_image_path_cache() -> None:
+    """
+    Vide les caches de résolution de chemins d'images.
+    À appeler en début de génération pour repartir d'un état frais
+    (les assets peuvent avoir changé entre deux jobs).
+    """
+    _cached_exists.cache_clear()
+    _cached_abspath.cache_clear()
+    _scan_dir.cache_clear()
+
+
 def resolve_image_path(
     pattern: str, 
     replacements: Dict[str, str], 
@@ -33,7 +104,7 @@ def resolve_image_path(
         path = resolve_image_path(pattern, replacements)
     """
     try:
-        variables = re.findall(r'\{([^}]+)\}', pattern)
+        variables = _VAR_RE.findall(pattern)
         resolved_path = pattern
         
         for var in variables:
@@ -52,21 +123,25 @@ def resolve_image_path(
                     logger.warning(f"Variable {var} non trouvée dans les balises")
                     return _try_default_path(default_path)
         
-        # Test PNG puis JPG
-        if os.path.exists(resolved_path):
-            absolute_path = os.path.abspath(resolved_path)
+        # Test PNG puis JPG : le listing du dossier est scanné une fois
+        # puis interrogé en mémoire pour toutes les variantes
+        directory, filename = os.path.split(resolved_path)
+        listing = _scan_dir(directory or ".")
+
+        if filename.lower() in listing:
+            absolute_path = _cached_abspath(resolved_path)
             logger.debug(f"Image PNG trouvée : {absolute_path}")
             return absolute_path
         else:
             logger.debug(f"Image PNG non trouvée : {resolved_path}")
-            
+
             if resolved_path.lower().endswith('.png'):
                 jpg_path = resolved_path[:-4] + '.jpg'
-                if os.path.exists(jpg_path):
-                    absolute_path = os.path.abspath(jpg_path)
+                if os.path.basename(jpg_path).lower() in listing:
+                    absolute_path = _cached_abspath(jpg_path)
                     logger.debug(f"Image JPG trouvée : {absolute_path}")
                     return absolute_path
-            
+
             return _try_default_path(default_path)
     
     except Exception as e:
@@ -74,6 +149,37 @@ def resolve_image_path(
         return _try_default_path(default_path)
 
 
+def resolve_image_paths_bulk(
+    patterns_and_replacements: List[Tuple[str, Dict[str, str], Optional[str]]]
+) -> List[Optional[str]]:
+    """
+    Résout plusieurs chemins d'images en parallèle.
+    Les stat() relâchent le GIL : un pool de threads recouvre les latences
+    (FS réseau notamment) et préchauffe _cached_exists/_cached_abspath
+    pour les résolutions unitaires qui suivent.
+
+    Args:
+        patterns_and_replacements: Liste de tuples
+            (pattern, replacements, default_path)
+
+    Returns:
+        Liste des chemins résolus, dans l'ordre d'entrée (None si absent)
+    """
+    if not patterns_and_replacements:
+        return []
+
+    if len(patterns_and_replacements) == 1:
+        pattern, replacements, default_path = patterns_and_replacements[0]
+        return [resolve_image_path(pattern, replacements, default_path)]
+
+    workers = min(16, len(patterns_and_replacements))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda args: resolve_image_path(*args),
+            patterns_and_replacements
+        ))
+
+
 def inject_image_to_slide(slide, image_config: dict, replacements: dict) -> None:
     """
     Injecte une image selon image_config, en résolvant le chemin via les balises.
@@ -92,12 +198,6 @@ def inject_image_to_slide(slide, image_config: dict, replacements: dict) -> None
             "background": False
         }
     """
-    # Constantes MsoZOrderCmd
-    MSO_BRINGTOFRONT = 0
-    MSO_SENDBACKWARD = 1
-    MSO_BRINGFORWARD = 2
-    MSO_SENDTOBACK = 3
-
     def _set_image_z_order(shape, send_to_background: bool) -> None:
         try:
             if send_to_background:
@@ -125,7 +225,7 @@ def inject_image_to_slide(slide, image_config: dict, replacements: dict) -> None
         logger.warning(f"Aucune image trouvée pour pattern='{pattern}'")
         return
     
-    if not os.path.exists(image_path):
+    if not _cached_exists(image_path):
         logger.warning(f"Image introuvable (après résolution): {image_path}")
         return
 
@@ -188,50 +288,93 @@ def inject_image_to_slide(slide, image_config: dict, replacements: dict) -> None
     logger.debug(f"Image '{os.path.basename(image_path)}' positionnée à l'{action}")
 
 
-def find_slides_by_ids(presentation, target_slide_ids: List[str]) -> Dict[str, object]:
+def find_slides_by_ids(
+    presentation,
+    target_slide_ids: List[str],
+    text_index: Optional[Dict[int, tuple]] = None
+) -> Dict[str, object]:
     """
     Trouve les slides PowerPoint contenant les IDs spécifiés.
     Gère les shapes groupées.
-    
+
     Args:
         presentation: Présentation PowerPoint
         target_slide_ids: Liste des IDs à rechercher (ex: ["A001", "A002"])
-        
+        text_index: Index {slide_index: (slide, texte)} issu de
+            build_slide_text_index, pour éviter de re-parcourir le deck
+
     Returns:
         Dict {slide_id: slide_object}
     """
-    def search_text_in_shape(shape, target_ids):
+    def search_text_in_shape(shape, combined_pattern):
         """Recherche récursive dans les shapes"""
         found_ids = {}
-        
+
         try:
-            if shape.Type == 6:  # Groupe
-                for i in range(1, shape.GroupItems.Count + 1):
-                    sub_results = search_text_in_shape(shape.GroupItems.Item(i), target_ids)
+            if shape.Type == MSO_GROUP:  # Groupe
+                # Énumération COM directe (un marshal par lot), repli par index
+                try:
+                    children = list(shape.GroupItems)
+                except Exception:
+                    children = [shape.GroupItems.Item(i) for i in range(1, shape.GroupItems.Count + 1)]
+                for child in children:
+                    sub_results = search_text_in_shape(child, combined_pattern)
                     found_ids.update(sub_results)
             elif hasattr(shape, 'HasTextFrame') and shape.HasTextFrame:
                 text = shape.TextFrame2.TextRange.Text
-                if text:
-                    for slide_id in target_ids:
-                        pattern = re.compile(r'\b' + re.escape(slide_id) + r'\b')
-                        if pattern.search(text):
-                            found_ids[slide_id] = True
+                # Un texte plus court que le plus petit ID ne peut pas matcher
+                if text and len(text) >= min_id_len:
+                    for match in combined_pattern.finditer(text):
+                        found_ids[match.group(1)] = True
         except:
             pass
-        
+
         return found_ids
-    
+
     slides_found = {}
-    
+
+    if not target_slide_ids:
+        return slides_found
+
+    # Une seule alternation compilée : chaque texte est parcouru en un
+    # passage au lieu d'une regex par ID recherché
+    combined_pattern = re.compile(
+        r'\b(' + '|'.join(re.escape(sid) for sid in target_slide_ids) + r')\b'
+    )
+    min_id_len = min(len(sid) for sid in target_slide_ids)
+
+    if text_index is not None:
+        # Texte déjà capturé : recherche purement locale, zéro appel COM
+        for slide_index, (slide, text) in text_index.items():
+            for match in combined_pattern.finditer(text):
+                slide_id = match.group(1)
+                if slide_id not in slides_found:
+                    slides_found[slide_id] = slide
+                    logger.debug(f"Slide {slide_id} trouvée (index {slide_index})")
+
+            if len(slides_found) == len(target_slide_ids):
+                break
+
+        missing_slides = [sid for sid in target_slide_ids if sid not in slides_found]
+        if missing_slides:
+            logger.warning(f"Slides non trouvées : {', '.join(missing_slides)}")
+
+        return slides_found
+
     for slide in presentation.Slides:
         for shape in slide.Shapes:
-            shape_results = search_text_in_shape(shape, target_slide_ids)
-            
+            shape_results = search_text_in_shape(shape, combined_pattern)
+
             for slide_id in shape_results:
                 if slide_id not in slides_found:
                     slides_found[slide_id] = slide
                     logger.debug(f"Slide {slide_id} trouvée (index {slide.SlideIndex})")
-    
+
+        # Tous les IDs localisés : inutile de parcourir le reste du deck
+        if len(slides_found) == len(target_slide_ids):
+            break
+
+
     missing_slides = [slide_id for slide_id in target_slide_ids if slide_id not in slides_found]
     if missing_slides:
         logger.warning(f"Slides non trouvées : {', '.join(missing_slides)}")
@@ -239,73 +382,81 @@ def find_slides_by_ids(presentation, target_slide_ids: List[str]) -> Dict[str, o
     return slides_found
 
 
+@functools.lru_cache(maxsize=2048)
 def clean_for_filename(text: str) -> str:
     """
     Nettoie un texte pour l'utiliser dans un nom de fichier.
-    
+    Mémoïsé : les mêmes marques/produits reviennent à chaque itération.
+
     Args:
         text: Texte à nettoyer
-        
+
     Returns:
         Texte nettoyé
     """
     if not text:
         return "unknown"
-    
-    cleaned = text.strip()
-    
-    replacements = {
-        " ": "_", "/": "_", "\\": "_", ":": "_", "*": "_", 
-        "?": "_", '"': "_", "<": "_", ">": "_", "|": "_",
-        "-": "_", ".": "_", "&": "and", "%": "pct"
-    }
-    
-    for old, new in replacements.items():
-        cleaned = cleaned.replace(old, new)
-    
-    while "__" in cleaned:
-        cleaned = cleaned.replace("__", "_")
-    
-    return cleaned.strip("_") if cleaned else "unknown"
 
+    # maketrans ne gère que les substitutions mono-caractère
+    cleaned = text.strip().replace("&", "and").replace("%", "pct")
+    cleaned = cleaned.translate(_FILENAME_TRANS)
+    cleaned = _UNDERSCORE_RUN_RE.sub("_", cleaned)
 
-def _find_balise_value_flexible(var_name: str, replacements: Dict[str, str]) -> Optional[str]:
-    """Recherche flexible d'une valeur de balise avec différentes variantes."""
-    search_patterns = [
+    return cleaned.strip("_") or "unknown"
+
+
+# Variantes de noms connues pour la recherche flexible de balises
+_NAME_VARIANTS = {
+    "Catégorie": ["Category", "Segment", "Type"],
+    "Marque": ["Brand", "Sous_marque", "SousMarque"],
+    "Distributeur": ["Distributor", "Enseigne"],
+    "Produit": ["Product"]
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _search_patterns(var_name: str) -> Tuple[str, ...]:
+    """Liste des clés candidates pour une variable, construite une fois"""
+    patterns = [
         f"[{var_name}]",
         f"[{var_name.lower()}]",
         f"[{var_name.upper()}]",
         f"[{var_name.title()}]",
     ]
-    
-    name_variants = {
-        "Catégorie": ["Category", "Segment", "Type"],
-        "Marque": ["Brand", "Sous_marque", "SousMarque"],
-        "Distributeur": ["Distributor", "Enseigne"],
-        "Produit": ["Product"]
-    }
-    
-    if var_name in name_variants:
-        for variant in name_variants[var_name]:
-            search_patterns.extend([
-                f"[{variant}]",
-                f"[{variant.lower()}]",
-                f"[{variant.upper()}]"
-            ])
-    
-    for pattern in search_patterns:
+
+    for variant in _NAME_VARIANTS.get(var_name, ()):
+        patterns.extend([
+            f"[{variant}]",
+            f"[{variant.lower()}]",
+            f"[{variant.upper()}]"
+        ])
+
+    return tuple(patterns)
+
+
+@functools.lru_cache(maxsize=1024)
+def _find_balise_value_cached(var_name: str, items: frozenset) -> Optional[str]:
+    """Résolution mémoïsée : mêmes variables et balises à chaque itération"""
+    replacements = dict(items)
+
+    for pattern in _search_patterns(var_name):
         if pattern in replacements:
             value = replacements[pattern]
             if value and value.strip():
                 return value if var_name == "Produit" else clean_for_filename(value)
-    
+
     return None
 
 
+def _find_balise_value_flexible(var_name: str, replacements: Dict[str, str]) -> Optional[str]:
+    """Recherche flexible d'une valeur de balise avec différentes variantes."""
+    return _find_balise_value_cached(var_name, frozenset(replacements.items()))
+
+
 def _try_default_path(default_path: Optional[str]) -> Optional[str]:
     """Essaie d'utiliser l'image par défaut."""
-    if default_path and os.path.exists(default_path):
-        absolute_path = os.path.abspath(default_path)
+    if default_path and _cached_exists(default_path):
+        absolute_path = _cached_abspath(default_path)
         logger.debug(f"Utilisation image par défaut : {absolute_path}")
         return absolute_path
     elif default_path:
@@ -325,7 +476,15 @@ def inject_images_to_slide(slide, images_config: list, replacements: dict) -> in
     injected = 0
     if not images_config:
         return 0
-    
+
+    # Préchauffe les caches de résolution en parallèle : les injections
+    # unitaires qui suivent ne paient plus aucun stat()
+    resolve_image_paths_bulk([
+        (cfg.get("pattern"), replacements, cfg.get("default_path"))
+        for cfg in images_config
+        if isinstance(cfg.get("pattern"), str) and cfg.get("pattern")
+    ])
+
     for img_cfg in images_config:
         try:
             inject_image_to_slide(slide, img_cfg, replacements)
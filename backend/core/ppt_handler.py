@@ -3,14 +3,101 @@ PowerPoint Handler - Gestion des opérations PowerPoint via win32com
 Adapté de spirits_study pour KAIVAA Builder
 """
 
+import functools
 import os
 import uuid
 import re
+import weakref
 from contextlib import contextmanager
 from typing import Dict, List, Optional
 import win32com.client as win32
 from loguru import logger
 
+# Recherche multi-motifs en un passage (Aho-Corasick) : optionnel,
+# l'alternation regex sert de repli si le module n'est pas installé
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
+# Constantes Office : résolues depuis le typelib généré (early binding)
+# quand il est disponible, sinon valeurs documentées en dur
+try:
+    from win32com.client import constants as _mso
+    MSO_GROUP = int(getattr(_mso, "msoGroup", 6))
+    MSO_TABLE = int(getattr(_mso, "msoTable", 19))
+    MSO_TEXT_BOX = int(getattr(_mso, "msoTextBox", 17))
+except Exception:
+    MSO_GROUP = 6
+    MSO_TABLE = 19
+    MSO_TEXT_BOX = 17
+
+
+@functools.lru_cache(maxsize=256)
+def _id_pattern(slide_id: str) -> "re.Pattern":
+    """Regex de recherche d'un ID de slide, compilée une fois par ID"""
+    return re.compile(r"\b" + re.escape(slide_id) + r"\b")
+
+
+@functools.lru_cache(maxsize=32)
+def _tags_pattern(tags: tuple) -> "re.Pattern":
+    """
+    Alternation compilée de toutes les balises, triées par longueur
+    décroissante pour matcher la balise la plus longue en premier.
+    Le même dict de balises sert pour toutes les shapes d'une slide :
+    la compilation n'est payée qu'une fois.
+    """
+    ordered = sorted(tags, key=len, reverse=True)
+    return re.compile("|".join(re.escape(t) for t in ordered))
+
+
+@functools.lru_cache(maxsize=8)
+def _tags_automaton(tags: tuple):
+    """
+    Automate Aho-Corasick des balises : K recherches de sous-chaînes
+    deviennent un unique passage O(L) sur le texte, quel que soit le
+    nombre de balises. Mis en cache par jeu de balises.
+    """
+    automaton = _ahocorasick.Automaton()
+    for tag in tags:
+        automaton.add_word(tag, tag)
+    automaton.make_automaton()
+    return automaton
+
+
+def _substitute_tags(text: str, replacements: Dict[str, str]) -> str:
+    """Calcule localement le texte avec toutes les balises remplacées"""
+    if _ahocorasick is not None:
+        automaton = _tags_automaton(tuple(replacements))
+        parts = []
+        last = 0
+        # iter_long : matchs les plus longs, sans chevauchement
+        for end, tag in automaton.iter_long(text):
+            start = end - len(tag) + 1
+            parts.append(text[last:start])
+            parts.append(str(replacements[tag]))
+            last = end + 1
+
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
+
+    pattern = _tags_pattern(tuple(replacements))
+    return pattern.sub(lambda m: str(replacements[m.group(0)]), text)
+
+
+def _group_children(group_items) -> list:
+    """
+    Matérialise les enfants d'un groupe en une énumération COM
+    (IEnumVARIANT, un marshal par lot) au lieu de Count + un Item(i)
+    marshalé par enfant ; repli par index si l'énumérateur manque.
+    """
+    try:
+        return list(group_items)
+    except Exception:
+        return [group_items.Item(i) for i in range(1, group_items.Count + 1)]
+
 
 @contextmanager
 def powerpoint_app_context(ppt_path: str, visible: bool = True, read_only: bool = False):
@@ -27,10 +114,31 @@ def powerpoint_app_context(ppt_path: str, visible: bool = True, read_only: bool
     """
     ppt_app = None
     presentation = None
+    original_settings = {}
     try:
         logger.debug(f"Ouverture PowerPoint: {ppt_path}")
-        ppt_app = win32.Dispatch("PowerPoint.Application")
+        # Early binding : les DISPIDs sont résolus une fois dans le module
+        # généré au lieu d'un GetIDsOfNames par accès de propriété
+        try:
+            ppt_app = win32.gencache.EnsureDispatch("PowerPoint.Application")
+        except Exception as bind_error:
+            logger.debug(f"Early binding indisponible ({bind_error}), Dispatch tardif")
+            ppt_app = win32.Dispatch("PowerPoint.Application")
         ppt_app.Visible = visible
+
+        # Pas de boîtes de dialogue ni de macros pendant les mutations en
+        # masse : chaque alerte bloquerait le pipeline, chaque rafraîchissement
+        # coûte un aller-retour d'affichage
+        try:
+            original_settings["DisplayAlerts"] = ppt_app.DisplayAlerts
+            ppt_app.DisplayAlerts = 1  # ppAlertsNone
+        except Exception:
+            pass
+        try:
+            original_settings["AutomationSecurity"] = ppt_app.AutomationSecurity
+            ppt_app.AutomationSecurity = 3  # msoAutomationSecurityForceDisable
+        except Exception:
+            pass
         presentation = ppt_app.Presentations.Open(
             os.path.abspath(ppt_path), 
             WithWindow=False, 
@@ -49,6 +157,11 @@ def powerpoint_app_context(ppt_path: str, visible: bool = True, read_only: bool
             except:
                 pass
         if ppt_app is not None:
+            for setting, value in original_settings.items():
+                try:
+                    setattr(ppt_app, setting, value)
+                except Exception:
+                    pass
             try:
                 ppt_app.Quit()
                 logger.debug("Application PowerPoint fermée")
@@ -56,15 +169,36 @@ def powerpoint_app_context(ppt_path: str, visible: bool = True, read_only: bool
                 pass
 
 
-def replace_tags_in_text_range(text_range, replacements: Dict[str, str]) -> None:
+def replace_tags_in_text_range(text_range, replacements: Dict[str, str], preserve_formatting: bool = False) -> None:
     """
     Remplace les balises dans un TextRange PowerPoint.
-    
+    Par défaut, le texte substitué est calculé localement puis écrit en
+    une seule affectation (un aller-retour COM au lieu d'un par
+    occurrence). Le chemin par caractères, qui préserve le formatage des
+    runs au prix de nombreux appels COM, reste disponible en option.
+
     Args:
         text_range: Objet TextRange PowerPoint
         replacements: Dictionnaire {balise: valeur}
+        preserve_formatting: Si True, remplace occurrence par occurrence
+            via Characters() pour conserver le formatage intra-texte
     """
+    if not replacements:
+        return
+
     full_text = text_range.Text
+
+    # Les balises sont toutes de la forme [Nom] : la plupart des textes
+    # n'en contiennent aucune, un test de sous-chaîne évite toute regex
+    if '[' not in full_text:
+        return
+
+    if not preserve_formatting:
+        new_text = _substitute_tags(full_text, replacements)
+        if new_text != full_text:
+            text_range.Text = new_text
+        return
+
     for tag, value in replacements.items():
         pos = full_text.find(tag)
         while pos != -1:
@@ -87,37 +221,269 @@ def replace_tags_in_shape(shape, replacements: Dict[str, str]) -> None:
         replacements: Dictionnaire {balise: valeur}
     """
     try:
-        if shape.Type == 6:  # Groupe
-            for i in range(1, shape.GroupItems.Count + 1):
-                replace_tags_in_shape(shape.GroupItems.Item(i), replacements)
-        elif shape.HasTable:
+        # Un seul accès Type : pour les types connus, inutile de sonder
+        # HasTable/HasTextFrame (un aller-retour COM chacun)
+        shape_type = shape.Type
+        if shape_type == MSO_GROUP:  # Groupe
+            for child in _group_children(shape.GroupItems):
+                replace_tags_in_shape(child, replacements)
+        elif shape_type == MSO_TABLE or (shape_type != MSO_TEXT_BOX and shape.HasTable):
             table = shape.Table
-            for row in range(1, table.Rows.Count + 1):
-                for col in range(1, table.Columns.Count + 1):
+            n_rows = table.Rows.Count
+            n_cols = table.Columns.Count
+            for row in range(1, n_rows + 1):
+                for col in range(1, n_cols + 1):
                     try:
                         text_range = table.Cell(row, col).Shape.TextFrame2.TextRange
                         replace_tags_in_text_range(text_range, replacements)
                     except:
                         continue
-        elif shape.HasTextFrame:
+        elif shape_type == MSO_TEXT_BOX or shape.HasTextFrame:
             replace_tags_in_text_range(shape.TextFrame2.TextRange, replacements)
     except Exception as e:
         logger.debug(f"Erreur remplacement balises shape: {e}")
 
 
-def find_slide_by_id(presentation, slide_id: str) -> Optional[object]:
+def _collect_shape_texts(shape, parts: List[str]) -> None:
+    """Collecte récursivement les textes d'une shape (groupes inclus)"""
+    try:
+        shape_type = shape.Type
+        if shape_type == MSO_GROUP:  # Groupe
+            for child in _group_children(shape.GroupItems):
+                _collect_shape_texts(child, parts)
+        elif shape_type == MSO_TEXT_BOX or (hasattr(shape, 'HasTextFrame') and shape.HasTextFrame):
+            text = shape.TextFrame2.TextRange.Text
+            if text:
+                parts.append(text)
+    except:
+        pass
+
+
+def _replace_and_check_shape(shape, replacements: Dict[str, str]) -> bool:
+    """
+    Remplace les balises d'une shape (groupes et tableaux inclus) et
+    vérifie la présence de [@SUPR@] dans le texte final, en une passe.
+
+    Returns:
+        True si le texte après remplacement contient [@SUPR@]
+    """
+    has_supr = False
+    try:
+        shape_type = shape.Type
+        if shape_type == MSO_GROUP:  # Groupe
+            for child in _group_children(shape.GroupItems):
+                if _replace_and_check_shape(child, replacements):
+                    has_supr = True
+        elif shape_type == MSO_TABLE or (shape_type != MSO_TEXT_BOX and shape.HasTable):
+            table = shape.Table
+            n_rows = table.Rows.Count
+            n_cols = table.Columns.Count
+            for row in range(1, n_rows + 1):
+                for col in range(1, n_cols + 1):
+                    try:
+                        text_range = table.Cell(row, col).Shape.TextFrame2.TextRange
+                        text = text_range.Text
+                        if replacements and '[' in text:
+                            new_text = _substitute_tags(text, replacements)
+                            if new_text != text:
+                                text_range.Text = new_text
+                            text = new_text
+                        if "[@SUPR@]" in text:
+                            has_supr = True
+                    except:
+                        continue
+        elif shape_type == MSO_TEXT_BOX or shape.HasTextFrame:
+            text_range = shape.TextFrame2.TextRange
+            text = text_range.Text
+            if text:
+                if replacements and '[' in text:
+                    new_text = _substitute_tags(text, replacements)
+                    if new_text != text:
+                        text_range.Text = new_text
+                    text = new_text
+                if "[@SUPR@]" in text:
+                    has_supr = True
+    except Exception as e:
+        logger.debug(f"Erreur traitement shape: {e}")
+    return has_supr
+
+
+def scan_presentation(
+    presentation,
+    target_slide_ids: Optional[List[str]] = None,
+    replacements: Optional[Dict[str, str]] = None
+) -> tuple:
+    """
+    Traversée fusionnée de la présentation : une seule énumération
+    Slides/Shapes localise les IDs cibles, remplace les balises et
+    détecte les slides à supprimer ([@SUPR@]), au lieu de trois
+    parcours COM distincts. Les slides contenant un ID cible sont
+    laissées intactes (leurs balises seront remplacées lors des boucles).
+
+    Args:
+        presentation: Présentation PowerPoint
+        target_slide_ids: IDs de slides à préserver (slides de boucle)
+        replacements: Dictionnaire {balise: valeur} à appliquer
+
+    Returns:
+        Tuple (slides_found {id: slide}, indices des slides [@SUPR@],
+        nombre de slides traitées)
+    """
+    combined_pattern = None
+    if target_slide_ids:
+        combined_pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(sid) for sid in target_slide_ids) + r')\b'
+        )
+
+    slides_found: Dict[str, object] = {}
+    supr_slide_indices: List[int] = []
+    processed_count = 0
+
+    for slide in presentation.Slides:
+        parts: List[str] = []
+        for shape in slide.Shapes:
+            _collect_shape_texts(shape, parts)
+        slide_text = "\n".join(parts)
+
+        is_target = False
+        if combined_pattern is not None:
+            for match in combined_pattern.finditer(slide_text):
+                slides_found.setdefault(match.group(1), slide)
+                is_target = True
+
+        if is_target:
+            # Slide de boucle : balises préservées, suppression sur le texte brut
+            if "[@SUPR@]" in slide_text:
+                supr_slide_indices.append(slide.SlideIndex)
+            continue
+
+        has_supr = False
+        for shape in slide.Shapes:
+            if _replace_and_check_shape(shape, replacements or {}):
+                has_supr = True
+
+        if has_supr:
+            supr_slide_indices.append(slide.SlideIndex)
+        processed_count += 1
+
+    return slides_found, supr_slide_indices, processed_count
+
+
+def build_slide_text_index(presentation) -> Dict[int, tuple]:
+    """
+    Parcourt la présentation UNE seule fois et capture le texte de chaque slide.
+    Chaque accès COM (Type, HasTextFrame, Text) est un aller-retour RPC :
+    cet index permet aux recherches répétées (une par ID de slide) de
+    travailler sur des chaînes locales. À reconstruire après toute
+    modification des slides (remplacement de balises, duplication...).
+
+    Args:
+        presentation: Présentation PowerPoint
+
+    Returns:
+        Dict {slide_index: (slide, texte concaténé de la slide)}
+    """
+    index = {}
+    for slide in presentation.Slides:
+        parts: List[str] = []
+        for shape in slide.Shapes:
+            _collect_shape_texts(shape, parts)
+        index[slide.SlideIndex] = (slide, "\n".join(parts))
+
+    logger.debug(f"Index texte construit : {len(index)} slides")
+    return index
+
+
+@functools.lru_cache(maxsize=64)
+def _ids_pattern(slide_ids: tuple) -> "re.Pattern":
+    """Alternation compilée d'un jeu d'IDs de slides"""
+    return re.compile(
+        r'\b(' + '|'.join(re.escape(sid) for sid in slide_ids) + r')\b'
+    )
+
+
+# Index inversé {slide_id: slide} par (présentation, jeu d'IDs). La clé
+# id() est protégée par un weakref : une présentation recyclée ne peut
+# pas resservir un index périmé
+_ID_INDEX_CACHE: Dict[tuple, tuple] = {}
+
+
+def build_slide_id_index(
+    presentation,
+    slide_ids: List[str],
+    refresh: bool = False
+) -> Dict[str, object]:
+    """
+    Construit un index inversé {slide_id: slide} en un seul parcours du
+    deck : N recherches d'IDs coûtent ensuite O(1) chacune au lieu d'un
+    parcours COM complet. Les slide_id étant des chaînes libres de la
+    config, l'index est bâti sur une alternation des IDs réellement
+    demandés (comme find_slides_by_ids), pas sur un motif supposé.
+    L'index est mis en cache par (présentation, jeu d'IDs) ; passer
+    refresh=True après toute modification des slides.
+
+    Args:
+        presentation: Présentation PowerPoint
+        slide_ids: IDs de slides à indexer (ex: ["A003", "A004"])
+        refresh: Si True, reconstruit l'index même s'il est en cache
+
+    Returns:
+        Dict {slide_id: slide} (première slide portant chaque ID)
+    """
+    if not slide_ids:
+        return {}
+
+    ids_key = tuple(sorted(set(slide_ids)))
+    key = (id(presentation), ids_key)
+
+    if not refresh:
+        cached = _ID_INDEX_CACHE.get(key)
+        if cached is not None and cached[0]() is presentation:
+            return cached[1]
+
+    pattern = _ids_pattern(ids_key)
+
+    index: Dict[str, object] = {}
+    for slide in presentation.Slides:
+        parts: List[str] = []
+        for shape in slide.Shapes:
+            _collect_shape_texts(shape, parts)
+        for match in pattern.finditer("\n".join(parts)):
+            index.setdefault(match.group(1), slide)
+
+    try:
+        _ID_INDEX_CACHE[key] = (weakref.ref(presentation), index)
+    except TypeError:
+        pass
+
+    logger.debug(f"Index des IDs construit : {len(index)}/{len(ids_key)} IDs")
+    return index
+
+
+def find_slide_by_id(presentation, slide_id: str, text_index: Optional[Dict[int, tuple]] = None) -> Optional[object]:
     """
     Trouve une slide contenant un ID spécifique.
-    
+
     Args:
         presentation: Présentation PowerPoint
         slide_id: ID à rechercher (ex: "A003")
-        
+        text_index: Index {slide_index: (slide, texte)} issu de
+            build_slide_text_index, pour éviter de re-parcourir le deck
+
     Returns:
         Slide PowerPoint ou None si non trouvée
     """
-    slide_id_pattern = re.compile(r"\b" + re.escape(slide_id) + r"\b")
-    
+    slide_id_pattern = _id_pattern(slide_id)
+
+    if text_index is not None:
+        for slide_index, (slide, text) in text_index.items():
+            if slide_id_pattern.search(text):
+                logger.debug(f"Slide {slide_id} trouvée à l'index {slide_index} (via index)")
+                return slide
+
+        logger.warning(f"Slide {slide_id} non trouvée")
+        return None
+
     for slide in presentation.Slides:
         for shape in slide.Shapes:
             if hasattr(shape, 'HasTextFrame') and shape.HasTextFrame:
@@ -133,6 +499,47 @@ def find_slide_by_id(presentation, slide_id: str) -> Optional[object]:
     return None
 
 
+def delete_slides_by_indices(presentation, slide_indices: List[int]) -> List[int]:
+    """
+    Supprime un lot de slides en un seul appel COM quand c'est possible.
+    Slides.Range(SAFEARRAY).Delete() ne déclenche qu'une repagination,
+    contre une par slide avec des Delete() unitaires ; repli slide par
+    slide (indices décroissants) si le marshalling du tableau échoue.
+
+    Args:
+        presentation: Présentation PowerPoint
+        slide_indices: Indices (1-based) des slides à supprimer
+
+    Returns:
+        Liste des indices effectivement supprimés
+    """
+    if not slide_indices:
+        return []
+
+    ordered = sorted(set(slide_indices))
+
+    try:
+        import pythoncom
+        from win32com.client import VARIANT
+
+        indices_array = VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_I4, ordered)
+        presentation.Slides.Range(indices_array).Delete()
+        logger.debug(f"{len(ordered)} slides supprimées en un appel")
+        return ordered
+    except Exception as e:
+        logger.debug(f"Suppression groupée impossible ({e}), suppression unitaire")
+
+    deleted = []
+    for slide_index in sorted(ordered, reverse=True):
+        try:
+            presentation.Slides(slide_index).Delete()
+            deleted.append(slide_index)
+        except Exception as delete_error:
+            logger.warning(f"Erreur suppression slide {slide_index}: {delete_error}")
+
+    return sorted(deleted)
+
+
 def check_and_remove_suppressed_slides(presentation) -> List[str]:
     """
     Vérifie et supprime les slides contenant la balise [@SUPR@].
@@ -147,21 +554,24 @@ def check_and_remove_suppressed_slides(presentation) -> List[str]:
         """Vérifie si une slide contient [@SUPR@]"""
         def check_shape_for_tag(shape) -> bool:
             try:
-                if shape.Type == 6:  # Groupe
-                    for i in range(1, shape.GroupItems.Count + 1):
-                        if check_shape_for_tag(shape.GroupItems.Item(i)):
+                shape_type = shape.Type
+                if shape_type == MSO_GROUP:  # Groupe
+                    for child in _group_children(shape.GroupItems):
+                        if check_shape_for_tag(child):
                             return True
-                elif shape.HasTable:
+                elif shape_type == MSO_TABLE or (shape_type != MSO_TEXT_BOX and shape.HasTable):
                     table = shape.Table
-                    for row in range(1, table.Rows.Count + 1):
-                        for col in range(1, table.Columns.Count + 1):
+                    n_rows = table.Rows.Count
+                    n_cols = table.Columns.Count
+                    for row in range(1, n_rows + 1):
+                        for col in range(1, n_cols + 1):
                             try:
                                 text = table.Cell(row, col).Shape.TextFrame2.TextRange.Text
                                 if "[@SUPR@]" in text:
                                     return True
                             except:
                                 continue
-                elif shape.HasTextFrame:
+                elif shape_type == MSO_TEXT_BOX or shape.HasTextFrame:
                     text = shape.TextFrame2.TextRange.Text
                     if "[@SUPR@]" in text:
                         return True
@@ -177,29 +587,28 @@ def check_and_remove_suppressed_slides(presentation) -> List[str]:
             pass
         return False
     
-    slides_to_remove = []
-    
+    # Détection d'abord, suppression groupée ensuite : une seule
+    # repagination au lieu d'une par slide supprimée
+    supr_indices = []
+
     try:
         slides_count = presentation.Slides.Count
         logger.debug(f"Vérification de {slides_count} slides pour [@SUPR@]")
-        
-        for i in range(slides_count, 0, -1):
+
+        for i in range(1, slides_count + 1):
             try:
-                slide = presentation.Slides(i)
-                if has_suppression_tag(slide):
-                    slides_to_remove.append(f"Slide {i}")
-                    try:
-                        slide.Delete()
-                        logger.info(f"Slide {i} supprimée (balise [@SUPR@])")
-                    except Exception as delete_error:
-                        logger.warning(f"Erreur suppression slide {i}: {delete_error}")
-                        continue
+                if has_suppression_tag(presentation.Slides(i)):
+                    supr_indices.append(i)
             except Exception as slide_error:
                 logger.warning(f"Erreur accès slide {i}: {slide_error}")
                 continue
-    
+
     except Exception as count_error:
         logger.warning(f"Impossible d'accéder aux slides: {count_error}")
         return []
-    
-    return slides_to_remove
\ No newline at end of file
+
+    deleted = delete_slides_by_indices(presentation, supr_indices)
+    for i in deleted:
+        logger.info(f"Slide {i} supprimée (balise [@SUPR@])")
+
+    return [f"Slide {i}" for i in deleted]
\ No newline at end of file
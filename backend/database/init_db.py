@@ -11,7 +11,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from loguru import logger
 
 from backend.config import DatabaseConfig
@@ -27,33 +27,31 @@ def init_database():
     try:
         # Création du moteur SQLAlchemy
         engine = create_engine(connection_string, echo=False)
-        
-        # Création de toutes les tables
-        logger.info("Création des tables...")
-        Base.metadata.create_all(engine)
-        logger.success("Tables créées avec succès")
-        
-        # Création d'un utilisateur admin par défaut
-        Session = sessionmaker(bind=engine)
-        session = Session()
-        
-        # Vérifier si un admin existe déjà
-        existing_admin = session.query(User).filter_by(username="admin").first()
-        
-        if not existing_admin:
-            admin_user = User(
-                username="admin",
-                email="admin@kaivaa.local",
-                role="admin",
-                is_active=True
+
+        # Une seule transaction pour le DDL et le seed admin
+        with engine.begin() as connection:
+            logger.info("Création des tables...")
+            Base.metadata.create_all(connection, checkfirst=True)
+            logger.success("Tables créées avec succès")
+
+            # Seed admin en un seul aller-retour, atomique : l'INSERT est
+            # ignoré si le username existe déjà (pas de SELECT préalable)
+            result = connection.execute(
+                pg_insert(User)
+                .values(
+                    username="admin",
+                    email="admin@kaivaa.local",
+                    role="admin",
+                    is_active=True
+                )
+                .on_conflict_do_nothing(index_elements=["username"])
             )
-            session.add(admin_user)
-            session.commit()
-            logger.success("Utilisateur admin créé (username: admin)")
-        else:
-            logger.info("Utilisateur admin existe déjà")
-        
-        session.close()
+
+            if result.rowcount:
+                logger.success("Utilisateur admin créé (username: admin)")
+            else:
+                logger.info("Utilisateur admin existe déjà")
+
         logger.success("Base de données initialisée avec succès !")
         
     except Exception as e:
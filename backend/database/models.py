@@ -5,7 +5,8 @@ Architecture prête pour multi-utilisateurs et gestion des droits.
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -17,7 +18,7 @@ class User(Base):
     __tablename__ = "users"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    username = Column(String(50), unique=True, nullable=False)
+    username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(100), unique=True, nullable=False)
     role = Column(String(20), default="user")  # admin, user, viewer
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -31,9 +32,14 @@ class User(Base):
 class Template(Base):
     """Templates créés par les utilisateurs"""
     __tablename__ = "templates"
-    
+
+    # Recherches dans la config JSON (ex: templates référençant une slide)
+    __table_args__ = (
+        Index("ix_template_config_gin", "config", postgresql_using="gin"),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(100), unique=True, nullable=False)
+    name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text)
     version = Column(String(20), default="1.0")
     
@@ -42,8 +48,8 @@ class Template(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Configuration (stockée en JSON)
-    config = Column(JSON, nullable=False)
+    # Configuration (JSONB : binaire, compressé, indexable par GIN)
+    config = Column(JSONB, nullable=False)
     
     # Chemins des fichiers
     config_file_path = Column(String(500))
@@ -55,7 +61,7 @@ class Template(Base):
     last_executed = Column(DateTime, nullable=True)
     
     # État
-    is_active = Column(Boolean, default=True)
+    is_active = Column(Boolean, default=True, index=True)
     is_public = Column(Boolean, default=False)
     
     # Relations
@@ -70,7 +76,7 @@ class TemplateVersion(Base):
     __tablename__ = "template_versions"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    template_id = Column(Integer, ForeignKey("templates.id", ondelete="CASCADE"))
+    template_id = Column(Integer, ForeignKey("templates.id", ondelete="CASCADE"), index=True)
     version = Column(String(20), nullable=False)
     
     # Configuration de cette version
@@ -88,7 +94,13 @@ class TemplateVersion(Base):
 class TemplatePermission(Base):
     """Gestion des droits d'accès aux templates (préparation future)"""
     __tablename__ = "template_permissions"
-    
+
+    # Une permission par couple (template, utilisateur) : l'index unique
+    # sert aussi les lookups de droits du tableau de bord
+    __table_args__ = (
+        Index("ix_perm_tmpl_user", "template_id", "user_id", unique=True),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     template_id = Column(Integer, ForeignKey("templates.id", ondelete="CASCADE"))
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -106,16 +118,21 @@ class TemplatePermission(Base):
 class ExecutionJob(Base):
     """Historique des générations de rapports"""
     __tablename__ = "execution_jobs"
-    
+
+    # Recherches par paramètre d'exécution (ex: jobs d'une marque donnée)
+    __table_args__ = (
+        Index("ix_job_parameters_gin", "parameters", postgresql_using="gin"),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
-    template_id = Column(Integer, ForeignKey("templates.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
-    
+    template_id = Column(Integer, ForeignKey("templates.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+
     # Paramètres d'exécution
-    parameters = Column(JSON, nullable=False)
-    
+    parameters = Column(JSONB, nullable=False)
+
     # État
-    status = Column(String(20), default="pending")  # pending, running, completed, failed
+    status = Column(String(20), default="pending", index=True)  # pending, running, completed, failed
     
     # Chemins de sortie
     output_excel_path = Column(String(500))
@@ -140,8 +157,8 @@ class CustomTable(Base):
     __tablename__ = "custom_tables"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    template_id = Column(Integer, ForeignKey("templates.id"))
-    
+    template_id = Column(Integer, ForeignKey("templates.id"), index=True)
+
     # Identification
     table_name = Column(String(100), nullable=False)
     description = Column(Text)
@@ -21,9 +21,9 @@ class ConfigGenerator:
         Args:
             output_path: Chemin de sortie
         """
-        yaml_content = self.config.to_yaml()
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(yaml_content)
-        
+        # YAML émis directement dans le fichier : pas de document
+        # intermédiaire en mémoire
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 18) as f:
+            self.config.to_yaml(stream=f)
+
         logger.info(f"Fichier config.yaml généré : {output_path}")
\ No newline at end of file
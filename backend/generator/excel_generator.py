@@ -2,11 +2,13 @@
 Générateur de templates Excel
 """
 
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from loguru import logger
 
 from backend.models.template_config import TemplateConfig
@@ -14,10 +16,22 @@ from backend.models.template_config import TemplateConfig
 
 class ExcelTemplateGenerator:
     """Génère des templates Excel pré-configurés"""
-    
+
+    # Styles partagés : construits une seule fois plutôt qu'à chaque cellule
+    _HEADER_FONT = Font(bold=True, color="FFFFFF")
+    _HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    _TITLE_FONT = Font(bold=True, size=14)
+    _TABLE_STYLE = TableStyleInfo(
+        name="TableStyleMedium9",
+        showFirstColumn=False,
+        showLastColumn=False,
+        showRowStripes=True,
+        showColumnStripes=False
+    )
+
     def __init__(self, config: TemplateConfig):
         self.config = config
-    
+
     def generate(
         self,
         source_file: Optional[Path] = None,
@@ -26,127 +40,141 @@ class ExcelTemplateGenerator:
     ) -> Path:
         """
         Génère un template Excel.
-        
+
         Args:
             source_file: Fichier Excel source (ou None)
             output_dir: Dossier de sortie
             create_new: Créer un nouveau fichier même si source fournie
-            
+
         Returns:
             Chemin du fichier généré
         """
         output_path = output_dir / "master.xlsx"
-        
+
         if not create_new and source_file and source_file.exists():
             logger.info(f"Copie du fichier Excel source : {source_file}")
-            import shutil
-            shutil.copy2(source_file, output_path)
+            # copyfile : copie par sendfile/copy_file_range sans stat/utime,
+            # les métadonnées de la source ne sont pas utiles au template
+            shutil.copyfile(source_file, output_path)
             return output_path
-        
+
         logger.info("Création d'un nouveau template Excel")
-        
-        wb = openpyxl.Workbook()
-        
-        # Supprimer la feuille par défaut
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
-        
-        # Créer les feuilles
+
+        # Mode write-only : les cellules sont écrites au fil de l'eau dans
+        # le XML au lieu d'être conservées en mémoire
+        wb = openpyxl.Workbook(write_only=True)
+
+        # Créer les feuilles (pas de feuille par défaut en mode write-only)
         self._create_balises_sheet(wb)
         self._create_charts_settings_sheet(wb)
         self._create_table_sheet(wb)
-        
+
         # Sauvegarder
         wb.save(output_path)
         logger.success(f"Template Excel créé : {output_path}")
-        
+
         return output_path
-    
-    def _create_balises_sheet(self, wb: openpyxl.Workbook) -> None:
-        """Crée la feuille Balises avec les paramètres"""
-        ws = wb.create_sheet("Balises", 0)
-        
-        # En-têtes
-        headers = ["Balise", "Description", "Valeur", "Type"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(1, col, header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        
-        # Ajouter les paramètres
-        for row, param in enumerate(self.config.parameters, 2):
-            ws.cell(row, 1, param.balise_ppt)
-            ws.cell(row, 2, param.description or "")
-            ws.cell(row, 3, str(param.default) if param.default else "")
-            ws.cell(row, 4, param.type)
-        
-        # Créer un tableau structuré
+
+    def _header_row(self, ws, headers: List[str]) -> List[WriteOnlyCell]:
+        """Construit une ligne d'en-têtes stylés pour une feuille write-only"""
+        cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = self._HEADER_FONT
+            cell.fill = self._HEADER_FILL
+            cells.append(cell)
+        return cells
+
+    @staticmethod
+    def _make_table(display_name: str, ref: str, headers: List[str], style: TableStyleInfo) -> Table:
+        """
+        Construit un tableau structuré avec ses colonnes explicites.
+
+        En mode write-only, openpyxl ne peut pas relire les en-têtes pour
+        déduire les colonnes : elles doivent être fournies manuellement.
+        """
         tab = Table(
-            displayName="Balises",
-            ref=f"A1:D{len(self.config.parameters) + 1}"
-        )
-        style = TableStyleInfo(
-            name="TableStyleMedium9",
-            showFirstColumn=False,
-            showLastColumn=False,
-            showRowStripes=True,
-            showColumnStripes=False
+            displayName=display_name,
+            ref=ref,
+            tableColumns=[
+                TableColumn(id=i, name=name)
+                for i, name in enumerate(headers, 1)
+            ]
         )
         tab.tableStyleInfo = style
-        ws.add_table(tab)
-        
-        # Ajuster largeurs
+        return tab
+
+    def _create_balises_sheet(self, wb: openpyxl.Workbook) -> None:
+        """Crée la feuille Balises avec les paramètres"""
+        ws = wb.create_sheet("Balises")
+
+        # Ajuster largeurs (avant l'écriture des lignes en mode write-only)
         ws.column_dimensions['A'].width = 20
         ws.column_dimensions['B'].width = 40
         ws.column_dimensions['C'].width = 20
         ws.column_dimensions['D'].width = 15
-    
+
+        # En-têtes
+        headers = ["Balise", "Description", "Valeur", "Type"]
+        ws.append(self._header_row(ws, headers))
+
+        # Ajouter les paramètres (une ligne par append)
+        for param in self.config.parameters:
+            ws.append((
+                param.balise_ppt,
+                param.description or "",
+                str(param.default) if param.default else "",
+                param.type
+            ))
+
+        # Créer un tableau structuré (lu par load_replacement_tags)
+        ws.add_table(self._make_table(
+            "Balises",
+            f"A1:D{len(self.config.parameters) + 1}",
+            headers,
+            self._TABLE_STYLE
+        ))
+
     def _create_charts_settings_sheet(self, wb: openpyxl.Workbook) -> None:
         """Crée la feuille Charts_settings"""
         ws = wb.create_sheet("Charts_settings")
-        
+
         # Paramètres de filtrage
-        ws['A1'] = "Paramètres de filtrage"
-        ws['A1'].font = Font(bold=True, size=14)
-        
-        ws['B3'] = "Distributeur"
-        ws['B4'] = "Sous-marque"
-        
-        ws['C3'] = "Leclerc"
-        ws['C4'] = "BOMBAY"
-        
+        title = WriteOnlyCell(ws, value="Paramètres de filtrage")
+        title.font = self._TITLE_FONT
+        ws.append([title])
+        ws.append(())
+        ws.append((None, "Distributeur", "Leclerc"))
+        ws.append((None, "Sous-marque", "BOMBAY"))
+
         # Tableau Loop si nécessaire
         if self.config.loops:
-            ws['A6'] = "Tableau Loop"
-            ws['A6'].font = Font(bold=True, size=14)
-            
-            ws['A8'] = "ID"
-            ws['B8'] = "Itération"
-            ws['C8'] = "Nombre de tests"
-            
-            for col in ['A8', 'B8', 'C8']:
-                ws[col].font = Font(bold=True, color="FFFFFF")
-                ws[col].fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            
-            for row, loop in enumerate(self.config.loops, 9):
-                ws.cell(row, 1, loop.loop_id)
-                ws.cell(row, 2, 1)
-                ws.cell(row, 3, 0)
-            
-            # Créer tableau structuré Loop
-            tab = Table(
-                displayName="Loop",
-                ref=f"A8:C{8 + len(self.config.loops)}"
-            )
-            style = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
-            tab.tableStyleInfo = style
-            ws.add_table(tab)
-    
+            ws.append(())
+            loop_title = WriteOnlyCell(ws, value="Tableau Loop")
+            loop_title.font = self._TITLE_FONT
+            ws.append([loop_title])
+            ws.append(())
+
+            headers = ["ID", "Itération", "Nombre de tests"]
+            ws.append(self._header_row(ws, headers))
+
+            for loop in self.config.loops:
+                ws.append((loop.loop_id, 1, 0))
+
+            # Créer tableau structuré Loop (lu par read_loop_table_count)
+            ws.add_table(self._make_table(
+                "Loop",
+                f"A8:C{8 + len(self.config.loops)}",
+                headers,
+                self._TABLE_STYLE
+            ))
+
     def _create_table_sheet(self, wb: openpyxl.Workbook) -> None:
         """Crée la feuille Table pour les données"""
         ws = wb.create_sheet("Table")
-        
-        ws['A1'] = "Feuille de données"
-        ws['A1'].font = Font(bold=True, size=14)
-        
-        ws['A3'] = "Les tableaux de données seront injectés ici"
\ No newline at end of file
+
+        title = WriteOnlyCell(ws, value="Feuille de données")
+        title.font = self._TITLE_FONT
+        ws.append([title])
+        ws.append(())
+        ws.append(("Les tableaux de données seront injectés ici",))
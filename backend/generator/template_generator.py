@@ -3,9 +3,11 @@ Générateur principal de templates
 """
 
 import os
+import shutil
 from pathlib import Path
 from typing import Dict, List, Optional
 from loguru import logger
+from pptx import Presentation
 
 from backend.config import PathConfig
 from backend.models.template_config import TemplateConfig
@@ -106,7 +108,6 @@ class TemplateGenerator:
         
         if create_new or source is None:
             logger.info("Création d'un PowerPoint vierge")
-            from pptx import Presentation
             prs = Presentation()
             prs.slide_width = 9144000  # 25.4 cm
             prs.slide_height = 6858000  # 19.05 cm
@@ -119,8 +120,9 @@ class TemplateGenerator:
             prs.save(str(ppt_path))
         else:
             logger.info(f"Copie du PowerPoint source : {source}")
-            import shutil
-            shutil.copy2(source, ppt_path)
+            # copyfile : copie par sendfile/copy_file_range sans stat/utime,
+            # les métadonnées de la source ne sont pas utiles au template
+            shutil.copyfile(source, ppt_path)
             
             # CORRECTION : Mettre à jour les liens Excel
             self._update_excel_links_in_ppt(ppt_path, excel_path)
@@ -130,28 +132,116 @@ class TemplateGenerator:
     def _update_excel_links_in_ppt(self, ppt_path: Path, excel_path: Path) -> None:
         """
         Met à jour tous les liens Excel dans le PowerPoint pour pointer vers le nouveau master.xlsx.
-        Utilise la même méthode que report_service.py qui fonctionne.
+
+        Réécrit directement les relations du .pptx (format zip) : pas
+        d'aller-retour COM par shape, l'opération prend quelques ms.
+        L'automation PowerPoint ne sert que de secours (.ppt legacy ou
+        archive illisible).
         """
-        from backend.core.ppt_handler import powerpoint_app_context
-        
         logger.info("Mise à jour des liens Excel dans le PowerPoint...")
-        
-        excel_path_abs = os.path.abspath(str(excel_path))
-        
+
+        # resolve : forme canonique (symlinks résolus) attendue par PowerPoint
+        excel_path_abs = str(Path(excel_path).resolve())
+
+        if ppt_path.suffix.lower() == ".pptx":
+            try:
+                updated_links = self._rewrite_excel_links_in_pptx(ppt_path, excel_path_abs)
+                if updated_links > 0:
+                    logger.success(f"{updated_links} lien(s) Excel mis à jour")
+                else:
+                    logger.warning("Aucun lien Excel trouvé dans le PowerPoint")
+                return
+            except Exception as e:
+                logger.warning(f"Réécriture directe des liens impossible ({e}), bascule sur PowerPoint")
+
+        self._update_excel_links_via_com(ppt_path, excel_path_abs)
+
+    @staticmethod
+    def _rewrite_excel_links_in_pptx(ppt_path: Path, excel_path_abs: str) -> int:
+        """
+        Réécrit les cibles .xlsx des relations externes du .pptx.
+
+        Les liens OLE/graphiques vivent dans ppt/slides/_rels/*.rels sous
+        forme d'attributs Target avec TargetMode="External" ; un éventuel
+        suffixe !Feuille!Plage est conservé. Les relations internes
+        (classeurs embarqués dans ppt/embeddings/) ne sont pas touchées.
+
+        Returns:
+            Nombre de liens mis à jour
+        """
+        import tempfile
+        import zipfile
+        import xml.etree.ElementTree as ET
+        from urllib.parse import quote
+
+        RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+        ET.register_namespace('', RELS_NS)
+
+        # Cible au format file:/// utilisé par PowerPoint pour les liens externes
+        new_target_url = "file:///" + quote(excel_path_abs.replace("\\", "/"), safe="/:")
+        updated_links = 0
+
+        def _rewrite_rels(data: bytes) -> bytes:
+            nonlocal updated_links
+            root = ET.fromstring(data)
+            changed = False
+            for rel in root.iter(f"{{{RELS_NS}}}Relationship"):
+                # Seules les relations externes pointent hors de l'archive :
+                # les classeurs embarqués n'ont pas de TargetMode
+                if rel.get("TargetMode") != "External":
+                    continue
+                target = rel.get("Target", "")
+                base, sep, fragment = target.partition("!")
+                if not base.lower().endswith(".xlsx"):
+                    continue
+                rel.set("Target", new_target_url + sep + fragment)
+                updated_links += 1
+                changed = True
+            if not changed:
+                return data
+            return ET.tostring(root, encoding='UTF-8', xml_declaration=True)
+
+        tmp_fd, tmp_name = tempfile.mkstemp(suffix=".pptx", dir=str(ppt_path.parent))
+        os.close(tmp_fd)
+        try:
+            with zipfile.ZipFile(ppt_path, 'r') as src, \
+                 zipfile.ZipFile(tmp_name, 'w', zipfile.ZIP_DEFLATED) as dst:
+                for item in src.infolist():
+                    data = src.read(item.filename)
+                    if item.filename.startswith("ppt/") and item.filename.endswith(".rels"):
+                        data = _rewrite_rels(data)
+                    dst.writestr(item, data)
+            if updated_links > 0:
+                os.replace(tmp_name, ppt_path)
+            else:
+                os.unlink(tmp_name)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return updated_links
+
+    def _update_excel_links_via_com(self, ppt_path: Path, excel_path_abs: str) -> None:
+        """Met à jour les liens via PowerPoint (méthode historique, lente)"""
+        from backend.core.ppt_handler import powerpoint_app_context
+
         with powerpoint_app_context(str(ppt_path), visible=True) as (ppt_app, presentation):
             updated_links = 0
-            
+
             for slide in presentation.Slides:
                 for shape in slide.Shapes:
                     try:
-                        if shape.Type == 3 and hasattr(shape, 'LinkFormat') and shape.LinkFormat:
+                        # Type lu une seule fois : chaque accès est un aller-retour COM
+                        shape_type = shape.Type
+                        if shape_type == 3 and shape.LinkFormat:
                             old_source = shape.LinkFormat.SourceFullName
                             shape.LinkFormat.SourceFullName = excel_path_abs
                             updated_links += 1
                             logger.debug(f"Lien mis à jour : {old_source} -> {excel_path_abs}")
                     except:
                         continue
-            
+
             if updated_links > 0:
                 logger.success(f"{updated_links} lien(s) Excel mis à jour")
                 presentation.Save()
@@ -172,40 +262,48 @@ class TemplateGenerator:
     
     def _generate_sql_template(self, sql_file: Path, table_name: str) -> None:
         """Génère un template SQL"""
-        # Construire les paramètres pour la requête
-        param_placeholders = ", ".join([f"{{{p.name}}}" for p in self.config.parameters])
-        
+        # Un seul parcours des paramètres : commentaires et filtres WHERE
+        param_comments = []
+        param_filters = []
+        for p in self.config.parameters:
+            name = p.name
+            param_comments.append(f"-- - {{{name}}} : {p.description or p.type}")
+            if p.type == 'string':
+                param_filters.append(f"  AND {name} = '{{{name}}}'")
+
         sql_content = f"""-- Template SQL pour {table_name}
 -- Généré automatiquement par KAIVAA Builder
 
 -- Paramètres disponibles :
-{chr(10).join([f"-- - {{{p.name}}} : {p.description or p.type}" for p in self.config.parameters])}
+{chr(10).join(param_comments)}
 
-SELECT 
+SELECT
     *
 FROM {table_name}
 WHERE 1=1
-{chr(10).join([f"  AND {p.name} = '{{{p.name}}}'" for p in self.config.parameters if p.type == 'string'])}
+{chr(10).join(param_filters)}
 ORDER BY created_at DESC;
 """
-        
-        with open(sql_file, 'w', encoding='utf-8') as f:
-            f.write(sql_content)
+
+        sql_file.write_text(sql_content, encoding='utf-8')
     
     def _generate_readme(self) -> Path:
         """Génère un README pour le template"""
         readme_path = self.template_dir / "README.md"
         
-        params_list = "\n".join([
-            f"- **{p.name}** ({p.type}): {p.description or 'Pas de description'}" + 
-            (" - Obligatoire" if p.required else "") 
-            for p in self.config.parameters
-        ])
-        
-        params_example = "\n".join([
-            f'        "{p.name}": "valeur",' 
-            for p in self.config.parameters
-        ])
+        # Un seul parcours des paramètres : liste descriptive et exemple
+        param_lines = []
+        example_lines = []
+        for p in self.config.parameters:
+            name = p.name
+            param_lines.append(
+                f"- **{name}** ({p.type}): {p.description or 'Pas de description'}"
+                + (" - Obligatoire" if p.required else "")
+            )
+            example_lines.append(f'        "{name}": "valeur",')
+
+        params_list = "\n".join(param_lines)
+        params_example = "\n".join(example_lines)
         
         # Construction du README sans utiliser de triples backticks dans la f-string
         readme_lines = [
@@ -263,9 +361,7 @@ ORDER BY created_at DESC;
             "```"
         ])
         
-        readme_content = "\n".join(readme_lines)
-        
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        
+        # Encodage unique puis écriture binaire : pas de couche TextIOWrapper
+        readme_path.write_bytes("\n".join(readme_lines).encode('utf-8'))
+
         return readme_path
\ No newline at end of file
@@ -2,8 +2,14 @@
 Modèles pour les custom tables (SQL + Python)
 """
 
+import re
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
+
+# Regex compilées une fois au chargement du module
+_TABLE_NAME_RE = re.compile(r'^[A-Z]\d{3}_[a-zA-Z_]+$')
+_DESTRUCTIVE_RE = re.compile(r'\b(DROP|DELETE|TRUNCATE)\b', re.IGNORECASE)
+_SELECT_RE = re.compile(r'\bSELECT\b', re.IGNORECASE)
 
 
 class CustomTableConfig(BaseModel):
@@ -25,21 +31,22 @@ class CustomTableConfig(BaseModel):
     is_validated: bool = Field(False, description="La table a été testée")
     last_validation_result: Optional[str] = Field(None, description="Résultat dernier test")
     
-    @validator('table_name')
+    @field_validator('table_name')
+    @classmethod
     def validate_table_name(cls, v):
         """Valide le format du nom de table"""
-        import re
-        if not re.match(r'^[A-Z]\d{3}_[a-zA-Z_]+$', v):
+        if not _TABLE_NAME_RE.match(v):
             raise ValueError("Format attendu : D009_custom (lettre + 3 chiffres + _ + nom)")
         return v
-    
-    @validator('sql_query')
+
+    @field_validator('sql_query')
+    @classmethod
     def validate_sql(cls, v):
         """Validation basique du SQL"""
-        v_upper = v.upper()
-        if 'DROP' in v_upper or 'DELETE' in v_upper or 'TRUNCATE' in v_upper:
+        # Regex insensibles à la casse : pas de copie v.upper() de la requête
+        if _DESTRUCTIVE_RE.search(v):
             raise ValueError("Opérations destructives interdites (DROP, DELETE, TRUNCATE)")
-        if 'SELECT' not in v_upper:
+        if not _SELECT_RE.search(v):
             raise ValueError("La requête doit contenir SELECT")
         return v
     
@@ -3,9 +3,16 @@ Modèles Pydantic pour la configuration des templates
 """
 
 from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field, validator
+import yaml
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
+# Types autorisés : frozensets et messages construits une fois au chargement
+_ALLOWED_PARAM_TYPES = frozenset({'string', 'integer', 'date', 'list'})
+_PARAM_TYPE_ERROR = f"Type doit être parmi {sorted(_ALLOWED_PARAM_TYPES)}"
+_ALLOWED_DS_TYPES = frozenset({'postgresql', 'mysql', 'sqlserver', 'excel', 'csv', 'api'})
+_DS_TYPE_ERROR = f"Type doit être parmi {sorted(_ALLOWED_DS_TYPES)}"
+
 
 class ParameterConfig(BaseModel):
     """Configuration d'un paramètre de template"""
@@ -17,11 +24,11 @@ class ParameterConfig(BaseModel):
     description: Optional[str] = Field(None, description="Description du paramètre")
     balise_ppt: str = Field(..., description="Balise dans PowerPoint (ex: [Sous_Marque])")
     
-    @validator('type')
+    @field_validator('type')
+    @classmethod
     def validate_type(cls, v):
-        allowed_types = ['string', 'integer', 'date', 'list']
-        if v not in allowed_types:
-            raise ValueError(f"Type doit être parmi {allowed_types}")
+        if v not in _ALLOWED_PARAM_TYPES:
+            raise ValueError(_PARAM_TYPE_ERROR)
         return v
 
 
@@ -31,11 +38,11 @@ class DataSourceConfig(BaseModel):
     connection_string: Optional[str] = Field(None, description="Chaîne de connexion")
     required_tables: List[str] = Field(default_factory=list, description="Tables nécessaires")
     
-    @validator('type')
+    @field_validator('type')
+    @classmethod
     def validate_type(cls, v):
-        allowed_types = ['postgresql', 'mysql', 'sqlserver', 'excel', 'csv', 'api']
-        if v not in allowed_types:
-            raise ValueError(f"Type doit être parmi {allowed_types}")
+        if v not in _ALLOWED_DS_TYPES:
+            raise ValueError(_DS_TYPE_ERROR)
         return v
 
 
@@ -120,15 +127,33 @@ class TemplateConfig(BaseModel):
             }
         }
     
-    def to_yaml(self) -> str:
-        """Exporte la config en YAML"""
-        import yaml
-        return yaml.dump(self.model_dump(), default_flow_style=False, allow_unicode=True)
+    def to_yaml(self, stream=None) -> Optional[str]:
+        """
+        Exporte la config en YAML.
+
+        Args:
+            stream: Fichier ouvert en écriture ; si fourni, le YAML y est
+                émis directement sans matérialiser le document en mémoire
+
+        Returns:
+            Le document YAML en chaîne, ou None si stream est fourni
+        """
+        # Dumper C (libyaml) quand disponible : ~10x plus rapide
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        return yaml.dump(
+            self.model_dump(),
+            stream=stream,
+            Dumper=dumper,
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True
+        )
     
     @classmethod
     def from_yaml(cls, yaml_path: str) -> "TemplateConfig":
         """Charge une config depuis YAML"""
-        import yaml
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        # Loader C (libyaml) quand disponible : ~10x plus rapide
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(yaml_path, 'r', encoding='utf-8', buffering=1 << 17) as f:
+            data = yaml.load(f, Loader=loader)
         return cls(**data)
\ No newline at end of file
@@ -2,14 +2,15 @@
 Service de gestion de la connexion à la base de données
 """
 
+import os
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, List
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session as SessionType
 from loguru import logger
 
 from backend.config import DatabaseConfig
-from backend.database.models import Base
+from backend.database.models import Base, ExecutionJob
 
 
 class DatabaseService:
@@ -17,23 +18,36 @@ class DatabaseService:
     
     _engine = None
     _session_factory = None
-    
+    _initialized = False
+
     @classmethod
     def initialize(cls):
         """Initialise la connexion à la base de données"""
-        if cls._engine is None:
-            connection_string = DatabaseConfig.get_connection_string()
-            logger.info(f"Initialisation de la base de données")
-            
-            cls._engine = create_engine(
-                connection_string,
-                pool_pre_ping=True,
-                pool_size=5,
-                max_overflow=10
-            )
-            
-            cls._session_factory = sessionmaker(bind=cls._engine)
-            logger.success("Base de données initialisée")
+        if cls._initialized:
+            return
+
+        connection_string = DatabaseConfig.get_connection_string()
+        logger.info(f"Initialisation de la base de données")
+
+        # pool_recycle remplace le pre-ping (un SELECT 1 par checkout) :
+        # les connexions sont recyclées avant le timeout d'inactivité serveur.
+        # LIFO : les connexions chaudes sont réutilisées en priorité.
+        # Taille du pool ajustable par déploiement via DB_POOL_SIZE /
+        # DB_MAX_OVERFLOW pour les charges concurrentes
+        cls._engine = create_engine(
+            connection_string,
+            pool_size=int(os.environ.get("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=30,
+            pool_recycle=1800,
+            pool_use_lifo=True,
+            future=True,
+            executemany_mode="values_plus_batch"
+        )
+
+        cls._session_factory = sessionmaker(bind=cls._engine)
+        cls._initialized = True
+        logger.success("Base de données initialisée")
     
     @classmethod
     def create_tables(cls):
@@ -55,7 +69,8 @@ class DatabaseService:
             with DatabaseService.get_session() as db:
                 templates = db.query(Template).all()
         """
-        cls.initialize()
+        if not cls._initialized:
+            cls.initialize()
         session = cls._session_factory()
         try:
             yield session
@@ -65,4 +80,62 @@ class DatabaseService:
             logger.error(f"Erreur base de données : {e}")
             raise
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    @classmethod
+    def delete_jobs_and_files(cls, db: SessionType, job_ids: List[int]) -> int:
+        """
+        Supprime un lot de jobs d'exécution et leurs fichiers de sortie.
+
+        Une seule requête IN récupère les chemins, une seule requête DELETE
+        supprime les lignes : 2 allers-retours SQL quel que soit le nombre
+        de jobs.
+
+        Args:
+            db: Session SQLAlchemy
+            job_ids: IDs des jobs à supprimer
+
+        Returns:
+            Nombre de jobs supprimés
+        """
+        if not job_ids:
+            return 0
+
+        rows = db.query(
+            ExecutionJob.id,
+            ExecutionJob.output_excel_path,
+            ExecutionJob.output_ppt_path
+        ).filter(ExecutionJob.id.in_(job_ids)).all()
+
+        for _, excel_path, ppt_path in rows:
+            for path in (excel_path, ppt_path):
+                if not path:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Fichier de sortie non supprimé ({path}) : {e}")
+
+        deleted = db.query(ExecutionJob).filter(
+            ExecutionJob.id.in_(job_ids)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        logger.info(f"{deleted} job(s) d'exécution supprimé(s)")
+        return deleted
+
+    @classmethod
+    def delete_job_and_files(cls, db: SessionType, job_id: int) -> bool:
+        """
+        Supprime un job d'exécution et ses fichiers de sortie.
+
+        Args:
+            db: Session SQLAlchemy
+            job_id: ID du job à supprimer
+
+        Returns:
+            True si le job existait et a été supprimé
+        """
+        return cls.delete_jobs_and_files(db, [job_id]) > 0
\ No newline at end of file
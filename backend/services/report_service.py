@@ -14,10 +14,15 @@ from backend.core.excel_handler import load_replacement_tags, excel_app_context
 from backend.core.ppt_handler import (
     powerpoint_app_context,
     replace_tags_in_shape,
-    find_slide_by_id,
-    check_and_remove_suppressed_slides
+    build_slide_id_index,
+    scan_presentation,
+    delete_slides_by_indices
+)
+from backend.core.image_handler import (
+    inject_image_to_slide,
+    find_slides_by_ids,
+    clear_image_path_cache
 )
-from backend.core.image_handler import inject_image_to_slide, find_slides_by_ids
 from backend.core.batch_processor import BatchProcessor, SlideAxis, create_slide_axes_from_config
 from backend.core.chart_handler import ChartExporter
 from backend.utils.file_utils import get_output_paths, ensure_directories
@@ -50,6 +55,9 @@ class ReportService:
         # Nettoyage préventif
         from backend.utils.cleanup import cleanup_before_run
         cleanup_before_run()
+
+        # Les assets ont pu changer depuis le job précédent
+        clear_image_path_cache()
         
         output_paths = self._generate_output_paths(parameters, output_name)
         ensure_directories(output_paths['excel_path'], output_paths['pptx_path'])
@@ -208,35 +216,26 @@ class ReportService:
         logger.info(f"Slides loop à ignorer : {loop_slide_ids}")
         
         with powerpoint_app_context(output_path, visible=True) as (ppt_app, presentation):
-            
-            # Identifier les INDEX des slides loop
-            loop_slide_indices = set()
-            for slide_id in loop_slide_ids:
-                slide = find_slide_by_id(presentation, slide_id)
-                if slide:
-                    loop_slide_indices.add(slide.SlideIndex)
-                    logger.debug(f"Slide loop {slide_id} trouvée à index {slide.SlideIndex}")
-            
-            # Remplacer les balises SAUF pour les slides loop
-            static_slides_processed = 0
-            loop_slides_skipped = 0
-            
-            for slide in presentation.Slides:
-                if slide.SlideIndex in loop_slide_indices:
-                    loop_slides_skipped += 1
-                    logger.debug(f"Slide index {slide.SlideIndex} ignorée (sera bouclée)")
-                else:
-                    for shape in slide.Shapes:
-                        replace_tags_in_shape(shape, replacements)
-                    static_slides_processed += 1
-            
-            logger.info(f"Balises remplacées : {static_slides_processed} slides statiques, {loop_slides_skipped} slides bouclées préservées")
-            
-            # Supprimer les slides [@SUPR@]
-            removed_slides = check_and_remove_suppressed_slides(presentation)
-            if removed_slides:
-                logger.info(f"Slides supprimées : {', '.join(removed_slides)}")
-            
+
+            # Traversée fusionnée : localisation des slides loop,
+            # remplacement des balises et détection [@SUPR@] en un seul
+            # parcours COM du deck
+            slides_found, supr_indices, static_slides_processed = scan_presentation(
+                presentation,
+                target_slide_ids=list(loop_slide_ids),
+                replacements=replacements
+            )
+
+            for slide_id, slide in slides_found.items():
+                logger.debug(f"Slide loop {slide_id} trouvée à index {slide.SlideIndex} (préservée)")
+
+            logger.info(f"Balises remplacées : {static_slides_processed} slides statiques, {len(slides_found)} slides bouclées préservées")
+
+            # Supprimer les slides [@SUPR@] en un seul lot
+            removed = delete_slides_by_indices(presentation, supr_indices)
+            if removed:
+                logger.info(f"Slides supprimées : {', '.join(f'Slide {i}' for i in removed)}")
+
             presentation.Save()
         
         return Path(output_path)
@@ -269,9 +268,14 @@ class ReportService:
                     with powerpoint_app_context(str(ppt_path), visible=True) as (ppt_app, presentation):
                         
                         # Trouver les slides sources
+                        # Index inversé construit en un parcours COM
+                        # (refresh : la boucle précédente a modifié le deck)
+                        id_index = build_slide_id_index(
+                            presentation, loop_config.slides, refresh=True
+                        )
                         source_slides = {}
                         for slide_id in loop_config.slides:
-                            slide = find_slide_by_id(presentation, slide_id)
+                            slide = id_index.get(slide_id)
                             if slide:
                                 source_slides[slide_id] = {
                                     'slide': slide,
@@ -418,8 +422,11 @@ class ReportService:
         replacements = load_replacement_tags(str(excel_path))
         
         with powerpoint_app_context(str(ppt_path), visible=True) as (ppt_app, presentation):
+            id_index = build_slide_id_index(
+                presentation, list(self.config.image_injections), refresh=True
+            )
             for slide_id, images_config in self.config.image_injections.items():
-                slide = find_slide_by_id(presentation, slide_id)
+                slide = id_index.get(slide_id)
                 if not slide:
                     logger.warning(f"Slide {slide_id} non trouvée pour injection d'images")
                     continue
@@ -446,8 +453,13 @@ class ReportService:
         from backend.core.excel_handler import read_excel_range_data
         
         with powerpoint_app_context(str(ppt_path), visible=True) as (ppt_app, presentation):
+            id_index = build_slide_id_index(
+                presentation,
+                [mapping.slide_id for mapping in self.config.slide_mappings],
+                refresh=True
+            )
             for mapping in self.config.slide_mappings:
-                slide = find_slide_by_id(presentation, mapping.slide_id)
+                slide = id_index.get(mapping.slide_id)
                 
                 if not slide:
                     logger.warning(f"Slide {mapping.slide_id} non trouvée pour mapping")
@@ -717,8 +729,9 @@ class ReportService:
             sht = excel_wb.sheets[sheet_name]
             
             table = None
+            target_name = table_name.lower()
             for t in sht.api.ListObjects:
-                if t.Name.strip().lower() == table_name.lower():
+                if t.Name.strip().lower() == target_name:
                     table = t
                     break
             
@@ -5,7 +5,7 @@ Service de gestion des templates
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from loguru import logger
 
 from backend.config import DatabaseConfig, PathConfig
@@ -96,7 +96,8 @@ class TemplateService:
         Returns:
             Template ou None
         """
-        return self.db.query(Template).filter_by(id=template_id).first()
+        # Session.get consulte l'identity map avant d'émettre un SELECT
+        return self.db.get(Template, template_id)
     
     def get_template_by_name(self, name: str) -> Optional[Template]:
         """
@@ -125,14 +126,16 @@ class TemplateService:
         Returns:
             Liste des templates
         """
-        query = self.db.query(Template)
-        
+        # Créateur chargé en une requête IN groupée : l'affichage des
+        # listes accédait sinon à template.creator en N+1 SELECT
+        query = self.db.query(Template).options(selectinload(Template.creator))
+
         if active_only:
             query = query.filter_by(is_active=True)
-        
+
         if user_id:
             query = query.filter_by(created_by=user_id)
-        
+
         return query.order_by(Template.created_at.desc()).all()
     
     def update_template(
@@ -4,12 +4,35 @@ Adapté de spirits_study pour KAIVAA Builder
 """
 
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from loguru import logger
 import os
 from backend.core.excel_handler import excel_app_context
 
 
+def _dataframe_to_com_matrix(df: pd.DataFrame) -> Tuple[tuple, ...]:
+    """
+    Convertit un DataFrame en tuple de tuples assignable en un seul appel COM.
+
+    NaN/NaT deviennent None (cellule vide) et les Timestamp pandas sont
+    convertis en datetime natifs que COM sait marshaler.
+
+    Args:
+        df: Données à convertir
+
+    Returns:
+        Matrice 2D prête pour une affectation Range.Value2
+    """
+    values = df.astype(object).where(pd.notna(df), None).to_numpy()
+    return tuple(
+        tuple(
+            v.to_pydatetime() if isinstance(v, pd.Timestamp) else v
+            for v in row
+        )
+        for row in values
+    )
+
+
 def inject_dataframe_to_excel(
     path: str,
     sheet_name: str,
@@ -61,8 +84,23 @@ def inject_dataframe_to_excel(
             if data_body_range:
                 data_body_range.ClearContents()
 
-            start_cell = sht.range((data_body_range.Row, data_body_range.Column))
-            start_cell.options(index=False, header=False).value = df
+            # Écriture en bloc via Value2 : une seule affectation COM pour
+            # toute la matrice au lieu d'une conversion cellule par cellule
+            n_rows, n_cols = df.shape
+            r0, c0 = data_body_range.Row, data_body_range.Column
+            api = sht.api
+            target = api.Range(
+                api.Cells(r0, c0),
+                api.Cells(r0 + n_rows - 1, c0 + n_cols - 1)
+            )
+            target.Value2 = _dataframe_to_com_matrix(df)
+
+            # L'application partagée est en recalcul manuel : un Calculate
+            # unique avant la sauvegarde remet les formules dépendantes à jour
+            try:
+                api.Application.Calculate()
+            except Exception as e:
+                logger.debug(f"Recalcul avant sauvegarde impossible : {e}")
 
             wb.save()
             logger.info(f"Données injectées dans '{sheet_name}' ({table_name}) : {len(df)} lignes")